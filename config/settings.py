@@ -77,13 +77,40 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Kurslar versiyasi, token va dashboard keshlari: bitta serverdagi barcha worker'lar uchun umumiy.
+    # Standart MAX_ENTRIES=300 da tasodifiy tozalash kurslar versiyasini ham o'chirib,
+    # barcha worker'larni qayta yuklashga majbur qiladi: chegara token va dashboard
+    # yozuvlaridan ancha yuqori, tozalash esa ozgina qismni o'chiradi.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'var' / 'shared',
+        'OPTIONS': {'MAX_ENTRIES': 100000, 'CULL_FREQUENCY': 10},
+    },
+    # Kirish urinishlari hisoblagichlari: bitta serverdagi barcha worker'lar uchun umumiy.
+    # Har bir IP va email alohida kalit: 300 talik standart chegarada tozalash
+    # hujum paytida to'lgan chelaklarni ham o'chirib yuborardi.
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'var' / 'throttle',
+        'OPTIONS': {'MAX_ENTRIES': 100000, 'CULL_FREQUENCY': 10},
+    },
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'configapp.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'configapp.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
@@ -1,7 +1,9 @@
 from django.contrib import admin
+
+from . import rollups, versions
 from .models import (
     User, Currency, Account, Transaction,
-    Budget, FinancialGoal, RecurringTransaction, ResetCode
+    Budget, FinancialGoal, RecurringTransaction, ResetCode, MonthlyCategorySpend, Category, OutboxEmail, CurrencyRate
 )
 
 @admin.register(User)
@@ -14,12 +16,24 @@ class ResetCodeAdmin(admin.ModelAdmin):
     list_display = ('user', 'code', 'created_at')
     readonly_fields = ('created_at',)
 
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'status', 'attempts', 'next_attempt_at', 'expires_at', 'created_at')
+    list_filter = ('status',)
+    readonly_fields = ('created_at',)
+
 @admin.register(Currency)
 class CurrencyAdmin(admin.ModelAdmin):
     list_display = ('code', 'rate')
     list_editable = ('rate',)
     search_fields = ('code',)
 
+@admin.register(CurrencyRate)
+class CurrencyRateAdmin(admin.ModelAdmin):
+    list_display = ('currency', 'date', 'rate')
+    list_filter = ('currency',)
+    date_hierarchy = 'date'
+
 @admin.register(Account)
 class AccountAdmin(admin.ModelAdmin):
     list_display = ('name', 'user', 'balance', 'currency')
@@ -37,6 +51,23 @@ class TransactionAdmin(admin.ModelAdmin):
         return obj.account.user.email
     get_user.short_description = 'User'
 
+    def save_model(self, request, obj, form, change):
+        if change:
+            rollups.unrecord([Transaction.objects.select_related('account').get(pk=obj.pk)])
+        super().save_model(request, obj, form, change)
+        rollups.record([obj])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        rollups.unrecord([obj])
+        versions.touch_owner(Account, pk=obj.account_id)
+
+    def delete_queryset(self, request, queryset):
+        deleted = list(queryset.select_related('account'))
+        super().delete_queryset(request, queryset)
+        rollups.unrecord(deleted)
+        versions.touch_owner(Account, pk__in={t.account_id for t in deleted})
+
 @admin.register(RecurringTransaction)
 class RecurringTransactionAdmin(admin.ModelAdmin):
     list_display = ('account', 'amount', 'frequency', 'next_date')
@@ -50,4 +81,16 @@ class BudgetAdmin(admin.ModelAdmin):
 @admin.register(FinancialGoal)
 class FinancialGoalAdmin(admin.ModelAdmin):
     list_display = ('user', 'title', 'target_amount', 'current_amount')
-    list_filter = ('currency',)
\ No newline at end of file
+    list_filter = ('currency',)
+
+@admin.register(MonthlyCategorySpend)
+class MonthlyCategorySpendAdmin(admin.ModelAdmin):
+    list_display = ('user', 'category', 'amount', 'currency', 'month', 'year')
+    list_filter = ('month', 'year')
+    list_select_related = ('user', 'category', 'currency')
+    search_fields = ('category__name', 'user__email')
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('name', 'key')
+    search_fields = ('key',)
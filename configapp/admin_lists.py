@@ -0,0 +1,86 @@
+import hashlib
+from math import ceil
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+
+from . import stats
+from .models import Account, Currency, FinancialGoal, Transaction
+
+PAGE_SIZE = 50
+COUNT_TTL = 60
+
+# Har bir ro'yxat: model, ustunlar (sarlavha, maydon yo'li), shablon qo'shimcha
+# ishlatadigan maydonlar, filtrlar (parametr, sarlavha, lookup) va filtrsiz
+# holatdagi jami son uchun stats hisoblagichi.
+maps = {
+    'accounts': {
+        'model': Account,
+        'columns': [(_('User'), 'user__email'), (_('Name'), 'name'), (_('Balance'), 'balance'), (_('Currency'), 'currency__code')],
+        'filters': [('user', _('User'), 'user__email'), ('currency', _('Currency'), 'currency__code')],
+        'counter': 'total_accounts',
+    },
+    'transactions': {
+        'model': Transaction,
+        'columns': [(_('Account'), 'account__name'), (_('Amount'), 'amount'), (_('Type'), 'type'), (_('Category'), 'category'), (_('Date'), 'date')],
+        'extra': ['account__user__email'],
+        'filters': [('user', _('User'), 'account__user__email'), ('type', _('Type'), 'type'), ('currency', _('Currency'), 'account__currency__code')],
+        'counter': 'total_transactions',
+    },
+    'currencies': {
+        'model': Currency,
+        'columns': [(_('Name'), 'name'), (_('Code'), 'code'), (_('Symbol'), 'symbol'), (_('Rate'), 'rate')],
+        'filters': [('code', _('Code'), 'code')],
+    },
+    'goals': {
+        'model': FinancialGoal,
+        'columns': [(_('User'), 'user__email'), (_('Title'), 'title'), (_('Target'), 'target_amount'), (_('Current'), 'current_amount')],
+        'filters': [('user', _('User'), 'user__email')],
+    },
+}
+
+
+def _relations(paths):
+    return sorted({path.rsplit('__', 1)[0] for path in paths if '__' in path})
+
+
+def _total(name, spec, queryset, filters):
+    if not filters and 'counter' in spec:
+        return stats.snapshot()[spec['counter']]
+    digest = hashlib.sha1(urlencode(sorted(filters.items())).encode()).hexdigest()
+    return cache.get_or_set(f'admin_list_count:{name}:{digest}', queryset.count, COUNT_TTL)
+
+
+def _page_number(value):
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def page(name, params):
+    spec = maps[name]
+    paths = [path for label, path in spec['columns']] + spec.get('extra', [])
+    queryset = spec['model'].objects.select_related(*_relations(paths)).only(*paths)
+    filters = {lookup: params[param].strip() for param, label, lookup in spec['filters'] if params.get(param, '').strip()}
+    queryset = queryset.filter(**filters)
+
+    sort = params.get('sort', '')
+    if sort.lstrip('-') not in {path for label, path in spec['columns']}:
+        sort = '-pk'
+    number = _page_number(params.get('page'))
+    offset = (number - 1) * PAGE_SIZE
+    rows = list(queryset.order_by(sort, '-pk')[offset:offset + PAGE_SIZE + 1])
+    total = _total(name, spec, queryset, filters)
+    return {
+        'data': rows[:PAGE_SIZE],
+        'columns': [{'label': label, 'sort': path} for label, path in spec['columns']],
+        'filters': [{'param': param, 'label': label, 'value': params.get(param, '')} for param, label, lookup in spec['filters']],
+        'sort': sort,
+        'page': number,
+        'has_next': len(rows) > PAGE_SIZE,
+        'has_previous': number > 1,
+        'total': total,
+        'num_pages': max(ceil(total / PAGE_SIZE), number),
+    }
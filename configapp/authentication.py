@@ -0,0 +1,47 @@
+import hashlib
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from . import caching
+
+PREFIX = 'auth_token:'
+
+
+def ttl():
+    return getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 60)
+
+
+def _cache_key(key):
+    # Token kalitining o'zi kesh kaliti sifatida saqlanmaydi.
+    return PREFIX + hashlib.sha256(key.encode()).hexdigest()
+
+
+def forget(*keys):
+    store = caching.shared()
+    cache_keys = [_cache_key(key) for key in keys]
+    if store is not None and cache_keys:
+        # Commit'dan keyin: aks holda parallel so'rov eski holatni qayta keshlab qo'yishi mumkin.
+        transaction.on_commit(lambda: store.delete_many(cache_keys))
+
+
+def forget_user(user_id):
+    forget(*Token.objects.filter(user_id=user_id).values_list('key', flat=True))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        store = caching.shared()
+        if store is None:
+            # Jarayon ichidagi keshni boshqa worker'dagi o'chirish tozalay olmaydi:
+            # bekor qilingan token TTL davomida ishlab turmasligi uchun kesh ishlatilmaydi.
+            return super().authenticate_credentials(key)
+        cache_key = _cache_key(key)
+        cached = store.get(cache_key)
+        if cached is not None:
+            return cached
+        user, token = super().authenticate_credentials(key)
+        store.set(cache_key, (user, token), ttl())
+        return user, token
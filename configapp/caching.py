@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+ALIAS = 'shared'
+
+
+# Barcha worker'lar bir xil qiymatni ko'rishi shart bo'lgan yozuvlar uchun kesh
+# (kurslar versiyasi, token autentifikatsiyasi, dashboard). LocMem har bir
+# jarayonda alohida bo'lgani uchun bunday sozlamada None qaytadi.
+def shared():
+    if ALIAS not in settings.CACHES:
+        return None
+    store = caches[ALIAS]
+    return None if isinstance(store, LocMemCache) else store
+
+
+def shared_or_default():
+    return shared() or caches['default']
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    if shared() is not None:
+        return []
+    return [checks.Warning(
+        f"CACHES['{ALIAS}'] worker'lar orasida umumiy emas (yo'q yoki LocMemCache).",
+        hint="Kurs o'zgarishlari boshqa worker'larga yetib bormaydi, token keshi o'chiriladi. "
+             "FileBasedCache, Redis yoki Memcached sozlang.",
+        id='configapp.W001',
+    )]
@@ -0,0 +1,127 @@
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from . import money, rates
+from .models import Account, CurrencyRate, Transaction
+
+PREFIX = 'dashboard:'
+
+
+def cache_ttl():
+    return getattr(settings, 'DASHBOARD_CACHE_TTL', 600)
+
+
+# Kursor foydalanuvchi ma'lumotlari versiyasi va kurslar versiyasidan tuziladi: har
+# qanday yozuv yoki kurs o'zgarishi yangi kursor (va kesh kaliti) beradi, eski
+# yozuv esa TTL bilan o'chib ketadi.
+def cursor(stamp, target_currency, period):
+    return f'{stamp.version}.{rates.version()}.{target_currency.code}.{period}'
+
+
+def cache_key(user_id, cursor):
+    return f'{PREFIX}{user_id}:{cursor}'
+
+
+# Delta uchun faqat kichik snapshot kerak: u to'liq payload'dan alohida saqlanadi.
+def snapshot_key(user_id, cursor):
+    return f'{PREFIX}snapshot:{user_id}:{cursor}'
+
+
+def snapshot(payload):
+    return {
+        'total': str(payload['total']),
+        'category_totals': dict(zip(payload['chart_labels'], payload['chart_data'])),
+        'budgets': {
+            str(b['info'].id): {
+                'category': b['info'].category, 'spent': str(b['spent']), 'limit': str(b['info'].amount_limit),
+                'currency': b['info'].currency.code, 'percent': b['percent'],
+            }
+            for b in payload['budgets']
+        },
+        'goals': {
+            str(g.id): {'title': g.title, 'current': str(g.current_amount), 'target': str(g.target_amount), 'percent': g.get_progress_percent()}
+            for g in payload['goals']
+        },
+    }
+
+
+def delta(previous, current):
+    # Faqat o'zgargan bo'limlar qaytariladi; lug'at bo'limlarida esa faqat
+    # o'zgargan kalitlar va o'chirilganlar ro'yxati.
+    changes = {}
+    for section, value in current.items():
+        if not isinstance(value, dict):
+            if previous.get(section) != value:
+                changes[section] = value
+            continue
+        before = previous.get(section, {})
+        changed = {key: item for key, item in value.items() if before.get(key) != item}
+        removed = [key for key in before if key not in value]
+        if changed or removed:
+            changes[section] = {'changed': changed, 'removed': removed}
+    return changes
+
+
+def month_bounds(year, month):
+    start = timezone.make_aware(datetime(year, month, 1))
+    if month == 12:
+        end = timezone.make_aware(datetime(year + 1, 1, 1))
+    else:
+        end = timezone.make_aware(datetime(year, month + 1, 1))
+    return start, end
+
+
+# So'rovlar (queryset) va ularning natijasini yig'uvchi funksiyalar alohida:
+# sinxron kod querysetni to'g'ridan-to'g'ri uzatadi, asinxron view'lar esa
+# avval uni async ORM orqali ro'yxatga aylantiradi.
+def balance_rows(user):
+    return Account.objects.filter(user=user).values('currency_id').annotate(total=Sum('balance')).order_by()
+
+
+# Kurs faqat tarixdagi yozuv sanalarida o'zgaradi: xarajatlar kun bo'yicha emas,
+# o'sha kunda amalda bo'lgan eng oxirgi kurs sanasi (har qanday valyuta) bo'yicha
+# guruhlanadi. Tarixdan oldingi kunlar uchun period NULL bo'ladi.
+def category_rows(user):
+    period = CurrencyRate.objects.filter(date__lte=OuterRef('day')).order_by('-date').values('date')[:1]
+    return (
+        Transaction.objects.filter(account__user=user, type='EXPENSE')
+        .annotate(day=TruncDate('date'))
+        .annotate(period=Subquery(period))
+        .values('category_ref_id', 'category_ref__name', 'account__currency_id', 'period')
+        .annotate(total=Sum('amount'))
+        .order_by()
+    )
+
+
+def total_balance(rows, target_currency):
+    return money.sum_converted([r['total'] for r in rows], [r['currency_id'] for r in rows], target_currency)
+
+
+def category_totals(rows, target_currency):
+    rows = list(rows)
+    # Har bir davr xarajati o'sha davrdagi kurs bilan: keyingi kurs o'zgarishlari o'tmishni o'zgartirmaydi.
+    # date.min - tarixning birinchi yozuvidan oldingi davr (rates ham eng birinchi kursni oladi).
+    converted = money.convert_many(
+        [money.to_minor(r['total']) for r in rows], [r['account__currency_id'] for r in rows], target_currency,
+        dates=[r['period'] or date.min for r in rows],
+    )
+    totals = {}
+    for r, units in zip(rows, converted):
+        totals[r['category_ref__name']] = totals.get(r['category_ref__name'], 0) + units
+    return {name: money.from_minor(units) for name, units in sorted(totals.items(), key=lambda item: item[1], reverse=True)}
+
+
+def budget_progress(budgets, spent_by_budget):
+    budget_data = []
+    for b in budgets:
+        spent = spent_by_budget[b.id]
+        budget_data.append({
+            'info': b,
+            'spent': spent,
+            'percent': int((spent / b.amount_limit) * 100) if b.amount_limit > 0 else 0
+        })
+    return budget_data
@@ -0,0 +1,58 @@
+import csv
+import json
+
+FIELDS = ['id', 'date', 'account', 'currency', 'type', 'category', 'amount']
+ITERATOR_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _row(t):
+    return {
+        'id': t.id,
+        'date': t.date.isoformat(),
+        'account': t.account.name,
+        'currency': t.account.currency.code,
+        'type': t.type,
+        'category': t.category,
+        'amount': str(t.amount),
+    }
+
+
+def export_rows(queryset):
+    for t in queryset.select_related('account__currency').iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _row(t)
+
+
+# ASGI'da StreamingHttpResponse sinxron iteratorni sync_to_async(list) bilan
+# butunlay o'qib oladi; asinxron iterator esa bo'laklab uzatiladi.
+async def aexport_rows(queryset):
+    async for t in queryset.select_related('account__currency').aiterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _row(t)
+
+
+def as_csv(rows):
+    writer = csv.DictWriter(_Echo(), fieldnames=FIELDS)
+    yield '\ufeff' + writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+async def aas_csv(rows):
+    writer = csv.DictWriter(_Echo(), fieldnames=FIELDS)
+    yield '\ufeff' + writer.writeheader()
+    async for row in rows:
+        yield writer.writerow(row)
+
+
+def as_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+async def aas_ndjson(rows):
+    async for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
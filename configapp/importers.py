@@ -0,0 +1,181 @@
+import csv
+import io
+import json
+import re
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from itertools import chain, islice
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.translation import gettext as _
+
+from . import ledger, rollups, stats, versions
+from .models import Account, Category, Transaction
+
+CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+JSON_READ_SIZE = 64 * 1024
+_SPACE = re.compile(r'\s*')
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'json'}
+TYPES = {code for code, label in Transaction.TYPES}
+_amount_field = Transaction._meta.get_field('amount')
+AMOUNT_QUANTUM = Decimal(1).scaleb(-_amount_field.decimal_places)
+MAX_AMOUNT = Decimal(10) ** (_amount_field.max_digits - _amount_field.decimal_places)
+
+
+class RowError(ValueError):
+    pass
+
+
+def guess_format(filename):
+    for suffix, fmt in FORMATS.items():
+        if filename.lower().endswith(suffix):
+            return fmt
+    return 'csv'
+
+
+def _json_lines(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def _json_array(buffer, text):
+    # Massiv elementlari bittadan dekodlanadi: fayl xotiraga to'liq yuklanmaydi.
+    # Buzilgan massivdan keyin davom etib bo'lmaydi, shuning uchun bitta xato qator qaytadi.
+    decoder = json.JSONDecoder()
+    pos, more, expect_item = buffer.index('[') + 1, True, True
+    while True:
+        pos = _SPACE.match(buffer, pos).end()
+        if buffer.startswith(']', pos):
+            return
+        if pos < len(buffer) and not expect_item:
+            if not buffer.startswith(',', pos):
+                yield None
+                return
+            pos, expect_item = pos + 1, True
+            continue
+        if pos < len(buffer):
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                end = None
+            # Bo'lak chegarasida kesilgan element (masalan, son) to'liq o'qilguncha kutiladi.
+            if end is not None and (end < len(buffer) or not more):
+                yield item
+                pos, expect_item = end, False
+                continue
+        if not more:
+            yield None
+            return
+        chunk = text.read(JSON_READ_SIZE)
+        buffer, pos, more = buffer[pos:] + chunk, 0, bool(chunk)
+
+
+def read_rows(stream, fmt):
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        yield from csv.DictReader(text)
+        return
+    if fmt == 'json':
+        # .json nomli fayl massiv ham, JSON Lines ham bo'lishi mumkin.
+        head = text.read(JSON_READ_SIZE)
+        if head.lstrip().startswith('['):
+            yield from _json_array(head, text)
+        else:
+            yield from _json_lines(chain((head + text.readline()).split('\n'), text))
+        return
+    yield from _json_lines(text)
+
+
+def _parse_date(value, tz):
+    if not value:
+        return timezone.now()
+    # JSON'dagi son yoki boshqa tur ham matn sifatida tekshiriladi.
+    value = str(value).strip()
+    try:
+        moment = parse_datetime(value)
+        day = parse_date(value) if moment is None else None
+    except ValueError:
+        moment = day = None
+    if moment is None:
+        if day is None:
+            raise RowError(_("Sana noto'g'ri: %(value)s") % {'value': value})
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, tz)
+    return moment
+
+
+def _build(row, accounts, tz):
+    if not isinstance(row, dict):
+        raise RowError(_("Qator o'qib bo'lmadi."))
+    account = accounts.get(str(row.get('account', '')).strip().lower())
+    if account is None:
+        raise RowError(_("Hisob topilmadi: %(account)s") % {'account': row.get('account')})
+    try:
+        amount = Decimal(str(row.get('amount', '')).strip())
+        # NaN quantize'dan o'tib ketadi va keyingi taqqoslashda InvalidOperation beradi.
+        if not amount.is_finite():
+            raise InvalidOperation
+        amount = amount.quantize(AMOUNT_QUANTUM)
+    except InvalidOperation:
+        raise RowError(_("Summa noto'g'ri: %(amount)s") % {'amount': row.get('amount')})
+    if amount <= 0:
+        raise RowError(_("Summa musbat bo'lishi kerak."))
+    if amount >= MAX_AMOUNT:
+        raise RowError(_("Summa juda katta: %(amount)s") % {'amount': row.get('amount')})
+    t_type = str(row.get('type', '')).strip().upper()
+    if t_type not in TYPES:
+        raise RowError(_("Tur noto'g'ri: %(type)s") % {'type': row.get('type')})
+    category = str(row.get('category') or '').strip()
+    if not category or len(category) > 100:
+        raise RowError(_("Kategoriya bo'sh yoki juda uzun."))
+    return Transaction(account=account, amount=amount, type=t_type, category=category, date=_parse_date(row.get('date'), tz))
+
+
+@transaction.atomic
+def _save_chunk(transactions):
+    category_ids = Category.objects.resolve_many(t.category for t in transactions)
+    for t in transactions:
+        t.category_ref_id = category_ids[t.category]
+    Transaction.objects.bulk_create(transactions)
+    stats.bump('total_transactions', len(transactions))
+    deltas = {}
+    for t in transactions:
+        deltas[t.account_id] = deltas.get(t.account_id, 0) + (t.amount if t.type == 'INCOME' else -t.amount)
+    for account_id, delta in deltas.items():
+        ledger.adjust_balance(account_id, delta)
+    rollups.record(transactions)
+    versions.touch_owner(Account, pk__in=list(deltas))
+
+
+def import_transactions(user, stream, fmt='csv', chunk_size=CHUNK_SIZE):
+    accounts = {}
+    for account in Account.objects.filter(user=user):
+        accounts[str(account.id)] = account
+        accounts.setdefault(account.name.strip().lower(), account)
+    report = {'imported': 0, 'failed': 0, 'errors': []}
+    tz = timezone.get_current_timezone()
+    rows = enumerate(read_rows(stream, fmt), start=1)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return report
+        valid = []
+        for line, row in chunk:
+            try:
+                valid.append(_build(row, accounts, tz))
+            except RowError as error:
+                report['failed'] += 1
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    report['errors'].append({'row': line, 'error': str(error)})
+        if valid:
+            _save_chunk(valid)
+            report['imported'] += len(valid)
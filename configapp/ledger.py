@@ -0,0 +1,30 @@
+from django.db.models import F
+
+from .models import Account, FinancialGoal, Transaction
+
+TYPES = {code for code, label in Transaction.TYPES}
+
+
+# Balans o'zgarishlari Python'da o'qib-yozish o'rniga bitta UPDATE bilan
+# bajariladi: parallel so'rovlar bir-birining natijasini yo'qotmaydi.
+# Foydalanuvchi ma'lumot versiyasini (versions.touch) chaqiruvchi oshiradi:
+# odatda bu Transaction yozuvining post_save signali orqali bo'ladi.
+def adjust_balance(account_id, delta):
+    Account.objects.filter(pk=account_id).update(balance=F('balance') + delta)
+
+
+def withdraw(account_id, amount):
+    return bool(Account.objects.filter(pk=account_id, balance__gte=amount).update(balance=F('balance') - amount))
+
+
+def apply(account_id, amount, t_type):
+    if t_type not in TYPES:
+        raise ValueError(f'Unknown transaction type: {t_type!r}')
+    if t_type == 'EXPENSE':
+        return withdraw(account_id, amount)
+    adjust_balance(account_id, amount)
+    return True
+
+
+def add_to_goal(goal_id, amount):
+    FinancialGoal.objects.filter(pk=goal_id).update(current_amount=F('current_amount') + amount)
@@ -0,0 +1,119 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework.fields import DateTimeField
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _model_field(model, attrs):
+    for attr in attrs[:-1]:
+        try:
+            model = model._meta.get_field(attr).related_model
+        except FieldDoesNotExist:
+            return None
+        if model is None:
+            return None
+    try:
+        return model._meta.get_field(attrs[-1])
+    except FieldDoesNotExist:
+        return None
+
+
+def _identity(value):
+    return value
+
+
+def _converter(field, tz):
+    if field is None:
+        return _identity
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if not isinstance(field, DateTimeField) or output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    # DateTimeField har qatorda joriy vaqt zonasini qayta so'raydi; bu yerda u
+    # butun ro'yxat uchun bir marta aniqlanadi.
+    tz = getattr(field, 'timezone', tz)
+
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _getter(attrs):
+    # DRF get_attribute'dagidek: zanjirdagi None'da to'xtaydi, metodlarni chaqiradi.
+    def get(instance):
+        for attr in attrs:
+            if instance is None:
+                return None
+            instance = getattr(instance, attr)
+        return instance() if callable(instance) else instance
+    return get
+
+
+class ReadSerializer:
+    # ModelSerializer maydonlari bir marta tahlil qilinadi: nuqtali source'lardan
+    # select_related/only() yig'iladi, har bir qator esa tayyor getter va DRF
+    # maydonining to_representation'i orqali dict'ga aylanadi.
+    def __init__(self, serializer_class):
+        model = serializer_class.Meta.model
+        self.related = set()
+        self.only = set()
+        self.needs_full_rows = False
+        self.fields = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            attrs = field.source_attrs
+            model_field = _model_field(model, attrs)
+            if model_field is None:
+                # Model metodi (masalan get_progress_percent) qaysi ustunlarni
+                # o'qishini bilmaymiz, shuning uchun only() qo'llanmaydi.
+                self.needs_full_rows = True
+                self.fields.append((name, _getter(attrs), field))
+                continue
+            if len(attrs) > 1:
+                self.related.add('__'.join(attrs[:-1]))
+            self.only.add('__'.join(attrs))
+            if isinstance(field, PrimaryKeyRelatedField):
+                path = attrs[:-1] + [model_field.attname]
+                self.fields.append((name, _getter(path), None))
+            else:
+                self.fields.append((name, _getter(attrs), field))
+
+    def prepare(self, queryset):
+        queryset = queryset.select_related(*self.related)
+        return queryset if self.needs_full_rows else queryset.only(*self.only)
+
+    def converters(self):
+        tz = timezone.get_current_timezone()
+        return [(name, getter, _converter(field, tz)) for name, getter, field in self.fields]
+
+    def to_representation(self, instance, converters=None):
+        row = {}
+        for name, getter, convert in converters or self.converters():
+            value = getter(instance)
+            row[name] = None if value is None else convert(value)
+        return row
+
+    def many(self, instances):
+        converters = self.converters()
+        return [self.to_representation(instance, converters) for instance in instances]
+
+
+@lru_cache(maxsize=None)
+def read_serializer(serializer_class):
+    return ReadSerializer(serializer_class)
+
+
+class FastListMixin:
+    def list(self, request, *args, **kwargs):
+        reader = read_serializer(self.get_serializer_class())
+        queryset = reader.prepare(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(reader.many(page))
+        return Response(reader.many(queryset))
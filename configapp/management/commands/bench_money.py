@@ -0,0 +1,68 @@
+import json
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from configapp import money, rates
+from configapp.models import Currency
+
+
+class Command(BaseCommand):
+    help = "Pul konvertatsiyasi tezligini o'lchaydi: qatorma-qator Decimal, money (Python) va money (NumPy). Ma'lumotlar oxirida qaytarib olinadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 100000, 1000000])
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            results = self.run(options['rows'], options['repeat'])
+            transaction.set_rollback(True)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run(self, sizes, repeat):
+        currencies = [
+            Currency.objects.create(code=code, name=code, rate=rate)
+            for code, rate in (('BNA', Decimal('1')), ('BNB', Decimal('12800')), ('BNC', Decimal('13950.45')))
+        ]
+        rates.invalidate()
+        target = currencies[1]
+        by_id = {c.id: c for c in currencies}
+        generator = random.Random(0)
+        results = []
+        for rows in sizes:
+            amounts = [Decimal(generator.randint(-10 ** 8, 10 ** 8)).scaleb(-2) for _ in range(rows)]
+            sources = [generator.choice(currencies).id for _ in range(rows)]
+            units = [money.to_minor(amount) for amount in amounts]
+            result = {
+                'rows': rows,
+                # Oldingi usul: har bir qator alohida Decimal bo'linish bilan.
+                'decimal_loop_s': self.measure(repeat, lambda: sum(
+                    (amount * by_id[source].rate / target.rate for amount, source in zip(amounts, sources)), Decimal('0')
+                )),
+                'money_total_s': self.measure(repeat, lambda: money.total(units, sources, target.id)),
+                'convert_many_python_s': self.measure(repeat, lambda: self.without_numpy(lambda: money.convert_many(units, sources, target.id))),
+            }
+            if money.np is not None:
+                result['convert_many_numpy_s'] = self.measure(repeat, lambda: money.convert_many(units, sources, target.id))
+            results.append(result)
+        return results
+
+    def without_numpy(self, action):
+        np, money.np = money.np, None
+        try:
+            return action()
+        finally:
+            money.np = np
+
+    def measure(self, repeat, action):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            action()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return round(best, 4)
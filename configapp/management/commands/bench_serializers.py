@@ -0,0 +1,72 @@
+import json
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from configapp.listing import read_serializer
+from configapp.models import Account, Currency, FinancialGoal, Transaction, User
+from configapp.renderers import FastJSONRenderer
+from configapp.serializers import AccountSerializer, GoalSerializer, TransactionSerializer
+
+
+class Command(BaseCommand):
+    help = "API ro'yxatlarini serializatsiya qilish tezligini o'lchaydi (ModelSerializer va ReadSerializer). Ma'lumotlar oxirida qaytarib olinadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            results = self.run(options['rows'], options['repeat'])
+            transaction.set_rollback(True)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run(self, rows, repeat):
+        currency = Currency.objects.create(code='BNC', name='Bench', rate=Decimal('1'))
+        user = User.objects.create(email='bench@example.invalid', username='bench')
+        accounts = Account.objects.bulk_create(
+            Account(user=user, name=f'Account {i}', type='CARD', balance=Decimal(i), currency=currency) for i in range(rows)
+        )
+        now = timezone.now()
+        Transaction.objects.bulk_create(
+            Transaction(account=accounts[i % 50], amount=Decimal(i), type='EXPENSE', category='Bench', date=now) for i in range(rows)
+        )
+        FinancialGoal.objects.bulk_create(
+            FinancialGoal(user=user, title=f'Goal {i}', target_amount=Decimal(1000), current_amount=Decimal(i % 1000), currency=currency)
+            for i in range(rows)
+        )
+        cases = [
+            ('accounts', AccountSerializer, Account.objects.filter(user=user)),
+            ('transactions', TransactionSerializer, Transaction.objects.filter(account__user=user).order_by('-date', '-id')),
+            ('goals', GoalSerializer, FinancialGoal.objects.filter(user=user)),
+        ]
+        results = []
+        for name, serializer_class, queryset in cases:
+            reader = read_serializer(serializer_class)
+            baseline = self.measure(repeat, lambda: JSONRenderer().render(serializer_class(queryset.all(), many=True).data))
+            joined = self.measure(repeat, lambda: JSONRenderer().render(serializer_class(reader.prepare(queryset), many=True).data))
+            fast = self.measure(repeat, lambda: FastJSONRenderer().render(reader.many(reader.prepare(queryset))))
+            results.append({
+                'resource': name,
+                'rows': rows,
+                'model_serializer_s': baseline,
+                'model_serializer_joined_s': joined,
+                'read_serializer_s': fast,
+                'speedup': round(baseline / fast, 2),
+                'rows_per_s': round(rows / fast),
+            })
+        return results
+
+    def measure(self, repeat, action):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            action()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return round(best, 4)
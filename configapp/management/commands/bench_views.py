@@ -0,0 +1,116 @@
+import json
+import platform
+import statistics
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from configapp import caching, dashboard, rates, synthetic, versions
+from configapp.models import Account
+
+
+class Command(BaseCommand):
+    help = "Asosiy view va API'larning kechikishi va so'rovlar sonini turli hajmdagi sintetik ma'lumotlarda o'lchaydi (JSON). Ma'lumotlar oxirida qaytarib olinadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="Jami tranzaksiyalar soni.")
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--accounts', type=int, default=3)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Natijani faylga yozish (standart: stdout).")
+
+    def handle(self, *args, **options):
+        results = []
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for size in options['sizes']:
+                with transaction.atomic():
+                    results.extend(self.run(size, options))
+                    transaction.set_rollback(True)
+        report = json.dumps({
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'users': options['users'],
+                'accounts_per_user': options['accounts'],
+                'repeat': options['repeat'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as stream:
+                stream.write(report + '\n')
+        else:
+            self.stdout.write(report)
+
+    def run(self, size, options):
+        users = synthetic.generate(
+            users=options['users'], accounts=options['accounts'], transactions=size, seed=options['seed'],
+        )['users']
+        user = users[0]
+        client = Client()
+        client.force_login(user)
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=user).key)
+        account = Account.objects.filter(user=user).first()
+        new_transaction = {'account': account.id, 'amount': '10', 'type': 'INCOME', 'category': 'Salary'}
+
+        def forget_dashboard():
+            # Umumiy kesh haqiqiy foydalanuvchilar bilan bo'lishiladi: faqat shu foydalanuvchining
+            # joriy dashboard yozuvlari o'chiriladi.
+            cursor = dashboard.cursor(versions.current(user), rates.resolve('UZS'), timezone.now().strftime('%Y-%m'))
+            caching.shared_or_default().delete_many([dashboard.cache_key(user.pk, cursor), dashboard.snapshot_key(user.pk, cursor)])
+
+        cases = [
+            # Dashboard ikki holatda: bo'sh kesh bilan va keshdan.
+            ('home_view', lambda: client.get(reverse('home')), forget_dashboard),
+            ('home_view_cached', lambda: client.get(reverse('home')), None),
+            ('budget_list', lambda: client.get(reverse('budget_list')), None),
+            ('history_view', lambda: client.get(reverse('history')), None),
+            ('add_transaction', lambda: client.post(reverse('add_transaction'), new_transaction), None),
+            ('api_accounts', lambda: api.get(reverse('api_accounts')), None),
+            ('api_transactions', lambda: api.get(reverse('api_transactions')), None),
+            ('api_goals', lambda: api.get(reverse('api_goals')), None),
+        ]
+        results = []
+        for name, request, before in cases:
+            timings, queries, status = [], [], None
+            for _ in range(options['repeat']):
+                if before:
+                    before()
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    response = request()
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries.append(len(ctx.captured_queries))
+                status = response.status_code
+            results.append({
+                'size': size,
+                'endpoint': name,
+                'status': status,
+                # Birinchi urinish keshlar sovuq holatda bo'lishi mumkin, shuning uchun ikkalasi.
+                'queries': {'min': min(queries), 'max': max(queries)},
+                'latency_ms': self.summary(timings),
+            })
+        return results
+
+    def summary(self, timings):
+        ordered = sorted(timings)
+        return {
+            'min': round(ordered[0], 3),
+            'median': round(statistics.median(ordered), 3),
+            'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            'max': round(ordered[-1], 3),
+        }
@@ -0,0 +1,25 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from configapp import synthetic
+
+
+class Command(BaseCommand):
+    help = "Sinov uchun sintetik ma'lumotlar yaratadi: foydalanuvchilar, hisoblar, tranzaksiyalar, byudjetlar, maqsadlar va takroriy to'lovlar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--accounts', type=int, default=3, help="Har bir foydalanuvchi uchun hisoblar soni.")
+        parser.add_argument('--transactions', type=int, default=10000, help="Jami tranzaksiyalar soni.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        report = synthetic.generate(
+            users=options['users'], accounts=options['accounts'], transactions=options['transactions'],
+            seed=options['seed'], batch_size=options['batch_size'],
+        )
+        report['users'] = [user.email for user in report['users']]
+        report['password'] = synthetic.PASSWORD
+        self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,25 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from configapp import importers
+
+
+class Command(BaseCommand):
+    help = "Bank ko'chirmasini (CSV yoki JSON Lines) foydalanuvchi tranzaksiyalariga import qiladi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('email')
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'])
+        parser.add_argument('--chunk-size', type=int, default=importers.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(email=options['email']).first()
+        if user is None:
+            raise CommandError(f"User {options['email']} not found.")
+        fmt = options['format'] or importers.guess_format(options['path'])
+        with open(options['path'], 'rb') as stream:
+            report = importers.import_transactions(user, stream, fmt, chunk_size=options['chunk_size'])
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
@@ -0,0 +1,19 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand
+
+from configapp import rates
+
+
+class Command(BaseCommand):
+    help = "Valyuta kurslari tarixini CSV fayldan (code,date,rate) yuklaydi; mavjud sanalar yangilanadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+            report = rates.load_history(csv.DictReader(stream), batch_size=options['batch_size'])
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from configapp import recurring
+
+
+class Command(BaseCommand):
+    help = "Muddati kelgan takroriy tranzaksiyalarni (RecurringTransaction) yozadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--loop', action='store_true', help="To'xtovsiz ishlash rejimi.")
+        parser.add_argument('--interval', type=int, default=300, help="--loop rejimida tekshiruvlar orasidagi soniyalar.")
+
+    def handle(self, *args, **options):
+        while True:
+            posted = recurring.post_due(batch_size=options['batch_size'])
+            self.stdout.write(f"Posted {posted} recurring transactions.")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
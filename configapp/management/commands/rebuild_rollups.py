@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from configapp import rollups
+
+
+class Command(BaseCommand):
+    help = "Oylik kategoriya xarajatlari jadvalini (MonthlyCategorySpend) tranzaksiyalardan qayta quradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rollups.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(f"Rebuilt {count} rollup rows.")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from configapp import search
+
+
+class Command(BaseCommand):
+    help = "Tranzaksiyalar bo'yicha to'liq matnli qidiruv indeksini qayta quradi."
+
+    def handle(self, *args, **options):
+        count = search.rebuild()
+        self.stdout.write(f"Indexed {count} transactions.")
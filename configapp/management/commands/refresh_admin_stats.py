@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from configapp import stats
+
+
+class Command(BaseCommand):
+    help = "Admin panel hisoblagichlarini bazadan qayta sanaydi (cron orqali ishga tushirish uchun)."
+
+    def handle(self, *args, **options):
+        for name, value in stats.refresh().items():
+            self.stdout.write(f"{name}: {value}")
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from configapp import outbox
+
+
+class Command(BaseCommand):
+    help = "Navbatdagi xatlarni (OutboxEmail) bitta ulanish orqali partiyalab yuboradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--loop', action='store_true', help="To'xtovsiz ishlash rejimi.")
+        parser.add_argument('--interval', type=int, default=10, help="--loop rejimida tekshiruvlar orasidagi soniyalar.")
+
+    def handle(self, *args, **options):
+        while True:
+            sent = total = outbox.deliver(batch_size=options['batch_size'])
+            # To'liq partiya - navbatda yana xat bor bo'lishi mumkin.
+            while sent == options['batch_size']:
+                sent = outbox.deliver(batch_size=options['batch_size'])
+                total += sent
+            self.stdout.write(f"Sent {total} queued emails.")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.1 on 2026-10-18 04:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0003_transaction_date_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyCategorySpend',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('category', models.CharField(max_length=100)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='configapp.currency')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'year', 'month', 'category', 'currency')},
+            },
+        ),
+    ]
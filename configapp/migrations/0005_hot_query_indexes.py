@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-18 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0004_monthlycategoryspend'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='budget',
+            index=models.Index(fields=['user', 'year', 'month', 'category'], name='budget_user_period_category'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringtransaction',
+            index=models.Index(fields=['next_date'], name='recurring_next_date'),
+        ),
+        migrations.AddIndex(
+            model_name='resetcode',
+            index=models.Index(fields=['user', 'created_at'], name='resetcode_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', 'type', 'date'], name='transaction_account_type_date'),
+        ),
+    ]
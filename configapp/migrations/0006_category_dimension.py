@@ -0,0 +1,113 @@
+# Generated by Django 6.0.1 on 2026-10-18 04:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import translation
+
+
+def _auto_prefixes():
+    prefixes = set()
+    for code, _name in settings.LANGUAGES:
+        with translation.override(code):
+            prefixes.add(translation.gettext("Auto: %(category)s") % {'category': ''})
+    return prefixes
+
+
+def clear_rollups(apps, schema_editor):
+    apps.get_model('configapp', 'MonthlyCategorySpend').objects.all().delete()
+
+
+def backfill_categories(apps, schema_editor):
+    Category = apps.get_model('configapp', 'Category')
+    prefixes = _auto_prefixes()
+    ids = {}
+
+    def resolve(name):
+        name = name.strip()
+        for prefix in prefixes:
+            if name.startswith(prefix):
+                name = name[len(prefix):].strip()
+        key = name.casefold()
+        if key not in ids:
+            ids[key] = Category.objects.get_or_create(key=key, defaults={'name': name})[0].id
+        return ids[key]
+
+    for model_name in ('Transaction', 'Budget', 'RecurringTransaction'):
+        model = apps.get_model('configapp', model_name)
+        names = model.objects.filter(category_ref__isnull=True).values_list('category', flat=True).distinct()
+        for name in list(names):
+            model.objects.filter(category=name, category_ref__isnull=True).update(category_ref_id=resolve(name))
+
+
+def rebuild_rollups(apps, schema_editor):
+    Transaction = apps.get_model('configapp', 'Transaction')
+    MonthlyCategorySpend = apps.get_model('configapp', 'MonthlyCategorySpend')
+    rows = (
+        Transaction.objects.filter(type='EXPENSE')
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values('account__user_id', 'year', 'month', 'category_ref_id', 'account__currency_id')
+        .annotate(total=Sum('amount'))
+        .order_by()
+    )
+    MonthlyCategorySpend.objects.bulk_create(
+        (
+            MonthlyCategorySpend(
+                user_id=row['account__user_id'], year=row['year'], month=row['month'],
+                category_id=row['category_ref_id'], currency_id=row['account__currency_id'], amount=row['total'],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='budget',
+            name='budget_user_period_category',
+        ),
+        migrations.AddField(
+            model_name='budget',
+            name='category_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='configapp.category'),
+        ),
+        migrations.AddField(
+            model_name='recurringtransaction',
+            name='category_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='configapp.category'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='category_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='configapp.category'),
+        ),
+        migrations.AddIndex(
+            model_name='budget',
+            index=models.Index(fields=['user', 'year', 'month', 'category_ref'], name='budget_user_period_category'),
+        ),
+        migrations.RunPython(clear_rollups, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='monthlycategoryspend',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='configapp.category'),
+        ),
+        migrations.RunPython(backfill_categories, migrations.RunPython.noop),
+        migrations.RunPython(rebuild_rollups, migrations.RunPython.noop),
+    ]
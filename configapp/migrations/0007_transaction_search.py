@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:10
+
+from django.db import migrations
+
+TABLE = 'configapp_transaction_search'
+
+INDEX_ROW = (
+    f"INSERT INTO {TABLE} (rowid, owner, category, account) "
+    "SELECT new.id, 'u' || a.user_id, new.category, a.name FROM configapp_account a WHERE a.id = new.account_id;"
+)
+
+FORWARD = [
+    f"CREATE VIRTUAL TABLE {TABLE} USING fts5(owner, category, account, tokenize='unicode61 remove_diacritics 2')",
+    # Egasi ustuni reytingga ta'sir qilmaydi, kategoriya hisob nomidan muhimroq.
+    f"INSERT INTO {TABLE} ({TABLE}, rank) VALUES ('rank', 'bm25(0.0, 10.0, 3.0)')",
+    f"CREATE TRIGGER configapp_transaction_search_ai AFTER INSERT ON configapp_transaction BEGIN {INDEX_ROW} END",
+    f"CREATE TRIGGER configapp_transaction_search_ad AFTER DELETE ON configapp_transaction BEGIN "
+    f"DELETE FROM {TABLE} WHERE rowid = old.id; END",
+    f"CREATE TRIGGER configapp_transaction_search_au AFTER UPDATE OF category, account_id ON configapp_transaction BEGIN "
+    f"DELETE FROM {TABLE} WHERE rowid = old.id; {INDEX_ROW} END",
+    f"CREATE TRIGGER configapp_account_search_au AFTER UPDATE OF name, user_id ON configapp_account BEGIN "
+    f"UPDATE {TABLE} SET owner = 'u' || new.user_id, account = new.name "
+    f"WHERE rowid IN (SELECT id FROM configapp_transaction WHERE account_id = new.id); END",
+    f"INSERT INTO {TABLE} (rowid, owner, category, account) "
+    f"SELECT t.id, 'u' || a.user_id, t.category, a.name FROM configapp_transaction t JOIN configapp_account a ON a.id = t.account_id",
+]
+
+BACKWARD = [
+    "DROP TRIGGER IF EXISTS configapp_account_search_au",
+    "DROP TRIGGER IF EXISTS configapp_transaction_search_au",
+    "DROP TRIGGER IF EXISTS configapp_transaction_search_ad",
+    "DROP TRIGGER IF EXISTS configapp_transaction_search_ai",
+    f"DROP TABLE IF EXISTS {TABLE}",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # Boshqa bazalarda qidiruv search.LikeSearchBackend orqali ishlaydi.
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql, params=None)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0006_category_dimension'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FORWARD), _run(BACKWARD)),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0.1 on 2026-10-18 04:51
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def keep_latest_codes(apps, schema_editor):
+    ResetCode = apps.get_model('configapp', 'ResetCode')
+    latest = ResetCode.objects.values('user').annotate(last_id=Max('id')).values('last_id')
+    ResetCode.objects.exclude(id__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0009_outbox_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_codes, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='resetcode',
+            name='resetcode_user_created',
+        ),
+        migrations.AddField(
+            model_name='resetcode',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='resetcode',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='resetcode',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='resetcode',
+            index=models.Index(fields=['created_at'], name='resetcode_created'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def seed_history(apps, schema_editor):
+    # Oldingi kurslar noma'lum: hozirgi kurs tarixning birinchi yozuvi bo'ladi
+    # va undan oldingi sanalarga ham qo'llanadi.
+    Currency = apps.get_model('configapp', 'Currency')
+    CurrencyRate = apps.get_model('configapp', 'CurrencyRate')
+    today = timezone.localdate()
+    CurrencyRate.objects.bulk_create(CurrencyRate(currency_id=pk, date=today, rate=rate) for pk, rate in Currency.objects.values_list('pk', 'rate'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0010_reset_code_per_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrencyRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('rate', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='history', to='configapp.currency')),
+            ],
+            options={
+                'unique_together': {('currency', 'date')},
+            },
+        ),
+        migrations.RunPython(seed_history, migrations.RunPython.noop),
+    ]
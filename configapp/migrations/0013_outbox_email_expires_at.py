@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0012_currency_rate_positive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
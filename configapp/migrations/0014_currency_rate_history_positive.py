@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:20
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0013_outbox_email_expires_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='currencyrate',
+            name='rate',
+            field=models.DecimalField(decimal_places=2, max_digits=15, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))]),
+        ),
+    ]
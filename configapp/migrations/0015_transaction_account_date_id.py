@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0014_currency_rate_history_positive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', 'date', 'id'], name='transaction_account_date_id'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configapp', '0015_transaction_account_date_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='currencyrate',
+            index=models.Index(fields=['date'], name='currencyrate_date'),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
+from django.core.validators import MinValueValidator
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from datetime import timedelta
 from decimal import Decimal
 
 class User(AbstractUser):
@@ -24,25 +27,103 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+class ResetCodeManager(models.Manager):
+    def issue(self, user, code):
+        now = timezone.now()
+        # Foydalanuvchi boshiga bitta kod: yangisi eskisining o'rnini egallaydi,
+        # muddati o'tganlar esa shu yerda tozalanadi, shuning uchun jadval o'smaydi.
+        self.filter(created_at__lte=now - timedelta(seconds=ResetCode.TTL)).delete()
+        reset, _ = self.update_or_create(user=user, defaults={'code': code, 'created_at': now, 'attempts': 0})
+        return reset
+
 class ResetCode(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    TTL = 120
+    MAX_ATTEMPTS = 5
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
     code = models.CharField(max_length=6)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    objects = ResetCodeManager()
+
+    class Meta:
+        indexes = [models.Index(fields=['created_at'], name='resetcode_created')]
 
     def is_valid(self):
         now = timezone.now()
         diff = now - self.created_at
-        return diff.total_seconds() < 120
+        return diff.total_seconds() < self.TTL and self.attempts < self.MAX_ATTEMPTS
+
+    def matches(self, code):
+        return constant_time_compare(self.code, code or '')
 
 class Currency(models.Model):
     code = models.CharField(max_length=3, unique=True)
     name = models.CharField(max_length=100, default='')
     symbol = models.CharField(max_length=10, default='')
-    rate = models.DecimalField(max_digits=15, decimal_places=2)
+    rate = models.DecimalField(max_digits=15, decimal_places=2, validators=[MinValueValidator(Decimal('0.01'))])
 
     def __str__(self):
         return self.code
 
+class CurrencyRate(models.Model):
+    currency = models.ForeignKey(Currency, on_delete=models.CASCADE, related_name='history')
+    date = models.DateField()
+    rate = models.DecimalField(max_digits=15, decimal_places=2, validators=[MinValueValidator(Decimal('0.01'))])
+
+    class Meta:
+        unique_together = ('currency', 'date')
+        # Dashboard xarajatlarni kurs davri bo'yicha guruhlaydi: har bir kun uchun eng yaqin sana qidiriladi.
+        indexes = [models.Index(fields=['date'], name='currencyrate_date')]
+
+    def __str__(self):
+        return f"{self.currency_id} {self.date}: {self.rate}"
+
+class CategoryManager(models.Manager):
+    def resolve(self, name):
+        name = name.strip()
+        category, created = self.get_or_create(key=category_key(name), defaults={'name': name})
+        return category
+
+    def resolve_many(self, names):
+        names = {name.strip() for name in names}
+        keys = {category_key(name): name for name in names}
+        self.bulk_create([Category(key=k, name=n) for k, n in keys.items()], ignore_conflicts=True)
+        ids = dict(self.filter(key__in=keys).values_list('key', 'id'))
+        return {name: ids[category_key(name)] for name in names}
+
+
+def category_key(name):
+    return name.strip().casefold()
+
+
+class Category(models.Model):
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True)
+
+    objects = CategoryManager()
+
+    def __str__(self):
+        return self.name
+
+
+class CategorizedMixin:
+    # Admin, API va view'lar orqali saqlanganda category_ref matndan to'ldiriladi;
+    # bulk_create qiladigan kod (import, takroriy tranzaksiyalar) uni o'zi beradi.
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_category = instance.__dict__.get('category')
+        return instance
+
+    def save(self, *args, **kwargs):
+        changed = self.category != getattr(self, '_saved_category', self.category)
+        if self.category and (self.category_ref_id is None or changed):
+            self.category_ref = Category.objects.resolve(self.category)
+        super().save(*args, **kwargs)
+        self._saved_category = self.category
+
+
 class Account(models.Model):
     TYPES = (
         ('CASH', 'Cash'),
@@ -57,7 +138,7 @@ class Account(models.Model):
     def __str__(self):
         return f"{self.name} ({self.currency.code})"
 
-class Budget(models.Model):
+class Budget(CategorizedMixin, models.Model):
     TYPES = (
         ('MONTHLY', 'Monthly'),
         ('STIPEND', 'Stipend'),
@@ -66,15 +147,19 @@ class Budget(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=100, choices=TYPES)
     category = models.CharField(max_length=100)
+    category_ref = models.ForeignKey(Category, null=True, blank=True, on_delete=models.PROTECT, related_name='+')
     amount_limit = models.DecimalField(max_digits=20, decimal_places=2)
     currency = models.ForeignKey(Currency, on_delete=models.PROTECT)
     month = models.IntegerField(default=timezone.now().month)
     year = models.IntegerField(default=timezone.now().year)
 
+    class Meta:
+        indexes = [models.Index(fields=['user', 'year', 'month', 'category_ref'], name='budget_user_period_category')]
+
     def __str__(self):
         return f"{self.category} - {self.month}/{self.year}"
 
-class Transaction(models.Model):
+class Transaction(CategorizedMixin, models.Model):
     TYPES = (
         ('INCOME', 'Income'),
         ('EXPENSE', 'Expense')
@@ -83,12 +168,20 @@ class Transaction(models.Model):
     amount = models.DecimalField(max_digits=20, decimal_places=2)
     type = models.CharField(max_length=10, choices=TYPES)
     category = models.CharField(max_length=100)
-    date = models.DateTimeField(auto_now_add=True)
+    category_ref = models.ForeignKey(Category, null=True, blank=True, on_delete=models.PROTECT, related_name='+')
+    date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['account', 'type', 'date'], name='transaction_account_type_date'),
+            # API va tarix sahifalari (date, id) kursori bo'yicha: tartiblash uchun vaqtinchalik B-tree kerak bo'lmaydi.
+            models.Index(fields=['account', 'date', 'id'], name='transaction_account_date_id'),
+        ]
 
     def __str__(self):
         return f"{self.type}: {self.amount}"
 
-class RecurringTransaction(models.Model):
+class RecurringTransaction(CategorizedMixin, models.Model):
     FREQUENCIES = (
         ('WEEKLY', 'Weekly'),
         ('MONTHLY', 'Monthly')
@@ -97,9 +190,13 @@ class RecurringTransaction(models.Model):
     amount = models.DecimalField(max_digits=20, decimal_places=2)
     type = models.CharField(max_length=10, choices=Transaction.TYPES)
     category = models.CharField(max_length=100)
+    category_ref = models.ForeignKey(Category, null=True, blank=True, on_delete=models.PROTECT, related_name='+')
     frequency = models.CharField(max_length=10, choices=FREQUENCIES)
     next_date = models.DateField()
 
+    class Meta:
+        indexes = [models.Index(fields=['next_date'], name='recurring_next_date')]
+
 class FinancialGoal(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=100)
@@ -114,4 +211,49 @@ class FinancialGoal(models.Model):
         return int(min(percent, 100))
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+class MonthlyCategorySpend(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    year = models.IntegerField()
+    month = models.IntegerField()
+    category = models.ForeignKey(Category, on_delete=models.PROTECT)
+    currency = models.ForeignKey(Currency, on_delete=models.PROTECT)
+    amount = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ('user', 'year', 'month', 'category', 'currency')
+
+    def __str__(self):
+        return f"{self.category} - {self.month}/{self.year}: {self.amount}"
+
+class DataVersion(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.user_id}: v{self.version}"
+
+class OutboxEmail(models.Model):
+    STATUSES = (
+        ('PENDING', 'Pending'),
+        ('FAILED', 'Failed')
+    )
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUSES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # Shu vaqtdan keyin xat ma'nosiz (masalan, tasdiqlash kodi eskirgan): yuborilmaydi.
+    expires_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_next_attempt')]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)}"
@@ -0,0 +1,104 @@
+from decimal import ROUND_HALF_EVEN, Decimal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import rates
+
+# Summalar kichik birliklarda (tiyin/sent) butun son sifatida hisoblanadi.
+# Yaxlitlash qoidalari:
+#   - kiritilgan Decimal kichik birlikka ROUND_HALF_EVEN bilan keltiriladi;
+#   - konvertatsiya aniq kasr (rates.ratio) orqali bajariladi va natija bir marta,
+#     yana ROUND_HALF_EVEN bilan yaxlitlanadi;
+#   - yig'indilarda har bir valyuta (sana berilsa, valyuta va sana) ichida aniq
+#     qo'shiladi, so'ng har bir yig'indi bir marta konvertatsiya qilinadi.
+DECIMAL_PLACES = 2
+QUANTUM = Decimal(1).scaleb(-DECIMAL_PLACES)
+ROUNDING = ROUND_HALF_EVEN
+# Bundan kichik massivlarda NumPy'ga o'tkazish xarajati foydadan katta.
+NUMPY_MIN_ROWS = 512
+INT64_MAX = 2 ** 63 - 1
+
+
+def to_minor(amount):
+    return int(Decimal(amount).quantize(QUANTUM, rounding=ROUNDING).scaleb(DECIMAL_PLACES))
+
+
+def from_minor(units):
+    return Decimal(int(units)).scaleb(-DECIMAL_PLACES)
+
+
+def _round_div(numerator, denominator):
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def convert_units(units, source, target, on=None):
+    ratio = rates.ratio(source, target, on)
+    return _round_div(units * ratio.numerator, ratio.denominator)
+
+
+def convert(amount, source, target, on=None):
+    return from_minor(convert_units(to_minor(amount), source, target, on))
+
+
+def _numpy_units(units, limit):
+    # int64'ga sig'maydigan qiymatlarda Python butun sonlariga qaytiladi.
+    if not units or max(max(units), -min(units)) > limit:
+        return None
+    return np.fromiter(units, dtype=np.int64, count=len(units))
+
+
+def _keys(sources, dates):
+    # dates berilsa har bir qator o'z sanasidagi kurs bilan konvertatsiya qilinadi.
+    return list(sources) if dates is None else list(zip(sources, dates))
+
+
+def _ratios(keys, target, dated):
+    return rates.ratios(set(keys), target, dated)
+
+
+def convert_many(units, sources, target, dates=None):
+    units = list(units)
+    keys = _keys(sources, dates)
+    ratios = _ratios(keys, target, dates is not None)
+    if np is not None and len(units) >= NUMPY_MIN_ROWS:
+        result = _convert_many_numpy(units, keys, ratios)
+        if result is not None:
+            return result
+    return [_round_div(amount * ratios[key].numerator, ratios[key].denominator) for amount, key in zip(units, keys)]
+
+
+def _convert_many_numpy(units, keys, ratios):
+    if max(ratio.denominator for ratio in ratios.values()) > INT64_MAX // 2:
+        return None
+    array = _numpy_units(units, INT64_MAX // max(max(ratio.numerator for ratio in ratios.values()), 1))
+    if array is None:
+        return None
+    index = {key: position for position, key in enumerate(ratios)}
+    positions = np.fromiter((index[key] for key in keys), dtype=np.intp, count=len(keys))
+    numerators = np.array([ratio.numerator for ratio in ratios.values()], dtype=np.int64)[positions]
+    denominators = np.array([ratio.denominator for ratio in ratios.values()], dtype=np.int64)[positions]
+    quotient, remainder = np.divmod(array * numerators, denominators)
+    twice = 2 * remainder
+    quotient += (twice > denominators) | ((twice == denominators) & (quotient % 2 == 1))
+    return quotient.tolist()
+
+
+def total(units, sources, target, dates=None):
+    # Valyuta (va sana) bo'yicha butun sonlarni qo'shish Python'da ham NumPy'dan
+    # sekin emas (bench_money), shuning uchun bu yerda massivga o'tkazilmaydi.
+    sums = {}
+    for amount, key in zip(units, _keys(sources, dates)):
+        sums[key] = sums.get(key, 0) + amount
+    ratios = _ratios(sums, target, dates is not None)
+    return sum(_round_div(amount * ratios[key].numerator, ratios[key].denominator) for key, amount in sums.items())
+
+
+def sum_converted(amounts, sources, target, dates=None):
+    return from_minor(total([to_minor(amount) for amount in amounts], sources, target, dates))
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+MAX_ATTEMPTS = 6
+BACKOFF = 30
+# Yuborish jarayonida qotib qolgan ishchi xatlarni shu vaqtdan keyin boshqasiga bo'shatadi.
+LEASE = 300
+
+
+def enqueue(subject, body, to, from_email=None, expires_at=None):
+    return OutboxEmail.objects.create(
+        subject=str(subject), body=str(body), to=list(to), from_email=from_email or settings.EMAIL_HOST_USER,
+        expires_at=expires_at,
+    )
+
+
+def _expire(now):
+    return OutboxEmail.objects.filter(status='PENDING', expires_at__lte=now).update(status='FAILED', last_error='Expired')
+
+
+def _claim(batch, now):
+    claimed = []
+    for email in batch:
+        # Boshqa ishchi shu xatni olgan bo'lsa, next_attempt_at o'zgargan va update 0 qaytaradi.
+        if OutboxEmail.objects.filter(pk=email.pk, status='PENDING', next_attempt_at=email.next_attempt_at).update(next_attempt_at=now + timedelta(seconds=LEASE)):
+            claimed.append(email)
+    return claimed
+
+
+def _retry(email, error, now):
+    email.attempts += 1
+    email.last_error = f'{type(error).__name__}: {error}'
+    next_attempt_at = now + timedelta(seconds=BACKOFF * 2 ** (email.attempts - 1))
+    # Keyingi urinish muddatdan keyin bo'lsa, eskirgan kodli xatni yuborishdan foyda yo'q.
+    if email.attempts >= MAX_ATTEMPTS or (email.expires_at and next_attempt_at >= email.expires_at):
+        email.status = 'FAILED'
+    else:
+        email.next_attempt_at = next_attempt_at
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def deliver(batch_size=50, now=None):
+    now = now or timezone.now()
+    _expire(now)
+    due = OutboxEmail.objects.filter(status='PENDING', next_attempt_at__lte=now).order_by('next_attempt_at', 'id')
+    claimed = _claim(list(due[:batch_size]), now)
+    if not claimed:
+        return 0
+    sent = []
+    # Butun partiya bitta ulanish (SMTP sessiyasi) orqali yuboriladi.
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for email in claimed:
+            _retry(email, error, now)
+        return 0
+    try:
+        for email in claimed:
+            message = EmailMessage(email.subject, email.body, email.from_email, email.to, connection=connection)
+            try:
+                message.send()
+            except Exception as error:
+                _retry(email, error, now)
+            else:
+                sent.append(email.pk)
+    finally:
+        connection.close()
+    OutboxEmail.objects.filter(pk__in=sent).delete()
+    return len(sent)
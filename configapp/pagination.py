@@ -0,0 +1,91 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+HISTORY_PAGE_SIZE = 50
+ADMIN_USERS_PAGE_SIZE = 25
+
+
+def encode_cursor(transaction):
+    raw = f"{transaction.date.isoformat()}|{transaction.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        date, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(date), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+
+
+def _page_queryset(queryset, cursor, size):
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        date, pk = position
+        queryset = queryset.filter(Q(date__lt=date) | Q(date=date, id__lt=pk))
+    return queryset.order_by('-date', '-id')[:size + 1]
+
+
+def _split_page(items, size):
+    next_cursor = encode_cursor(items[size - 1]) if len(items) > size else None
+    return items[:size], next_cursor
+
+
+def keyset_page(queryset, cursor=None, size=HISTORY_PAGE_SIZE):
+    return _split_page(list(_page_queryset(queryset, cursor, size)), size)
+
+
+async def akeyset_page(queryset, cursor=None, size=HISTORY_PAGE_SIZE):
+    return _split_page([t async for t in _page_queryset(queryset, cursor, size)], size)
+
+
+# DRF CursorPagination pozitsiyani faqat birinchi maydon (date) bo'yicha saqlab,
+# bir xil sanali qatorlarni OFFSET bilan o'tkazib yuboradi. Bu yerda kursor
+# tarix sahifasidagi kabi (date, id) juftligi: har bir sahifa indeks bo'yicha davom etadi.
+class TransactionCursorPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page, self.next_cursor = keyset_page(queryset, request.query_params.get(self.cursor_query_param), self.get_page_size(request))
+        return page
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': self.cursor_query_param, 'required': False, 'in': 'query', 'schema': {'type': 'string'}},
+            {'name': self.page_size_query_param, 'required': False, 'in': 'query', 'schema': {'type': 'integer'}},
+        ]
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+from bisect import bisect_right
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from . import caching
+from .models import Currency, CurrencyRate
+
+VERSION_KEY = 'currency_rates:version'
+
+_lock = threading.Lock()
+_state = {'version': None}
+
+
+# Versiya umumiy keshda: admin'dagi tahrir barcha worker'larning xotiradagi kursini eskirtiradi.
+def _shared_version():
+    return caching.shared_or_default().get_or_set(VERSION_KEY, lambda: uuid4().hex, timeout=None)
+
+
+def version():
+    return _shared_version()
+
+
+def invalidate():
+    caching.shared_or_default().set(VERSION_KEY, uuid4().hex, timeout=None)
+
+
+def _current():
+    global _state
+    version = _shared_version()
+    state = _state
+    if state['version'] == version:
+        return state
+    if 'currencies' in state and _in_event_loop():
+        # Asinxron view ichida bazaga sinxron murojaat qilib bo'lmaydi; kesh
+        # keyingi aresolve() chaqiruvida (thread ichida) yangilanadi.
+        return state
+    with _lock:
+        if _state['version'] != version:
+            currencies = list(Currency.objects.order_by('id'))
+            # Nol yoki manfiy kurs bilan bo'lish barcha sahifalarni buzmasligi uchun
+            # bunday valyuta (yoki tarix yozuvi) konvertatsiyada qatnashmaydi.
+            priced = [c for c in currencies if c.rate > 0]
+            history = {}
+            for currency_id, day, value in CurrencyRate.objects.filter(rate__gt=0).order_by('currency_id', 'date').values_list('currency_id', 'date', 'rate'):
+                dates, values = history.setdefault(currency_id, ([], []))
+                dates.append(day)
+                values.append(Fraction(value))
+            _state = {
+                'version': version,
+                'currencies': currencies,
+                'by_id': {c.id: c for c in currencies},
+                'by_code': {c.code: c for c in currencies},
+                # Kurslar nisbati aniq kasr sifatida: yaxlitlash faqat money modulida bo'ladi.
+                'ratios': {(a.id, b.id): Fraction(a.rate) / Fraction(b.rate) for a in priced for b in priced},
+                'current': {c.id: Fraction(c.rate) for c in priced},
+                'history': history,
+            }
+        return _state
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _id(currency):
+    return currency if isinstance(currency, int) else currency.id
+
+
+def currencies():
+    return _current()['currencies']
+
+
+def by_id(currency_id):
+    return _current()['by_id'].get(currency_id)
+
+
+def by_code(code):
+    return _current()['by_code'].get(code)
+
+
+def resolve(code, fallback='UZS'):
+    state = _current()
+    return state['by_code'].get(code) or state['by_code'].get(fallback) or next(iter(state['currencies']), None)
+
+
+def _rate_on(state, currency_id, day):
+    dates, values = state['history'].get(currency_id, ((), ()))
+    if not dates:
+        return state['current'][currency_id]
+    # Tarix boshlanishidan oldingi sanalarga eng birinchi ma'lum kurs qo'llanadi.
+    return values[max(bisect_right(dates, day) - 1, 0)]
+
+
+def _ratio(state, source, target, on):
+    if on is None:
+        return state['ratios'][(_id(source), _id(target))]
+    return _rate_on(state, _id(source), on) / _rate_on(state, _id(target), on)
+
+
+def ratio(source, target, on=None):
+    return _ratio(_current(), source, target, on)
+
+
+# Partiya uchun: kurslar holati (va umumiy keshdagi versiya) bir marta o'qiladi.
+# dated bo'lsa kalitlar (manba, sana) juftliklari, aks holda faqat manbalar.
+def ratios(keys, target, dated=False):
+    state = _current()
+    if dated:
+        return {key: _ratio(state, key[0], target, key[1]) for key in keys}
+    return {key: _ratio(state, key, target, None) for key in keys}
+
+
+def _clean_rate(value):
+    # Model maydoni qoidalari: chekli, musbat va max_digits ichida. Aks holda bitta
+    # qator butun partiyani (yoki keyinchalik har bir konvertatsiyani) buzadi.
+    field = CurrencyRate._meta.get_field('rate')
+    return field.clean(Decimal(value.strip()).quantize(Decimal(1).scaleb(-field.decimal_places)), None)
+
+
+def load_history(rows, batch_size=1000):
+    ids = dict(Currency.objects.values_list('code', 'id'))
+    history, errors = {}, []
+    for line, row in enumerate(rows, start=2):
+        try:
+            key = (ids[row['code'].strip().upper()], parse_date(row['date'].strip()))
+            if key[1] is None:
+                raise ValueError(row['date'])
+            history[key] = _clean_rate(row['rate'])
+        except (KeyError, ValueError, AttributeError, InvalidOperation, ValidationError) as error:
+            errors.append({'line': line, 'error': repr(error)})
+    today = timezone.localdate()
+    with transaction.atomic():
+        CurrencyRate.objects.bulk_create(
+            [CurrencyRate(currency_id=currency_id, date=day, rate=value) for (currency_id, day), value in history.items()],
+            batch_size=batch_size, update_conflicts=True, unique_fields=['currency', 'date'], update_fields=['rate'],
+        )
+        # Currency.rate "joriy" kurs bo'lib qoladi: bugungacha bo'lgan eng oxirgi yozuvga tenglanadi.
+        for currency_id in {currency_id for currency_id, day in history}:
+            latest = CurrencyRate.objects.filter(currency_id=currency_id, date__lte=today).order_by('-date').first()
+            if latest is not None:
+                Currency.objects.filter(pk=currency_id).update(rate=latest.rate)
+        transaction.on_commit(invalidate)
+    return {'loaded': len(history), 'errors': errors}
+
+
+# Pul konvertatsiya qiladigan har bir asinxron view boshida chaqiriladi: bo'sh yoki
+# eskirgan holat thread ichida yangilanadi, so'rovning qolgan qismi xotiradan o'qiydi.
+async def arefresh():
+    await sync_to_async(_current)()
+
+
+async def aresolve(code, fallback='UZS'):
+    return await sync_to_async(resolve)(code, fallback)
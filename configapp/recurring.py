@@ -0,0 +1,103 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from . import ledger, rollups, stats, versions
+from .models import Account, Category, RecurringTransaction, Transaction
+
+FREQUENCY_DAYS = {'WEEKLY': 7, 'MONTHLY': 30}
+
+
+class _Overdrawn(Exception):
+    pass
+
+
+def _posted_at(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _due_dates(item, today):
+    step = timedelta(days=FREQUENCY_DAYS[item.frequency])
+    day = item.next_date
+    while day <= today:
+        yield day
+        day += step
+
+
+def post_due(today=None, batch_size=500):
+    today = today or timezone.now().date()
+    posted = 0
+    due = RecurringTransaction.objects.filter(next_date__lte=today).select_related('account').order_by('next_date', 'id')
+    queryset = due
+    while True:
+        batch = list(queryset[:batch_size])
+        if not batch:
+            return posted
+        last = batch[-1]
+        # Yozilgan elementlar next_date'i oshgani uchun filtrdan chiqib ketadi,
+        # mablag' yetmay qolganlari esa shu kursor orqali qayta o'qilmaydi.
+        queryset = due.filter(Q(next_date__gt=last.next_date) | Q(next_date=last.next_date, id__gt=last.id))
+        posted += _post_batch(batch, today)
+
+
+def _claim(item, days):
+    next_date = days[-1] + timedelta(days=FREQUENCY_DAYS[item.frequency])
+    # Boshqa ishchi shu yozuvni allaqachon o'tkazgan bo'lsa, update 0 qaytaradi.
+    return RecurringTransaction.objects.filter(pk=item.pk, next_date=item.next_date).update(next_date=next_date)
+
+
+def _post_item(item, today):
+    days = list(_due_dates(item, today))
+    if not days or not _claim(item, days):
+        return []
+    if item.type == 'EXPENSE':
+        # Mablag' har bir davr uchun ledger.withdraw'ning shartli UPDATE'i bilan
+        # tekshiriladi: oldindan o'qilgan (eskirgan) balansga tayanilmaydi.
+        paid = 0
+        while paid < len(days) and ledger.withdraw(item.account_id, item.amount):
+            paid += 1
+        if not paid:
+            raise _Overdrawn(item.account_id)
+        if paid < len(days):
+            days = days[:paid]
+            RecurringTransaction.objects.filter(pk=item.pk).update(next_date=days[-1] + timedelta(days=FREQUENCY_DAYS[item.frequency]))
+    else:
+        ledger.adjust_balance(item.account_id, item.amount * len(days))
+    # Avtomatik yozuvlar asl kategoriyaga bog'lanadi, shunda byudjetda hisobga olinadi.
+    if item.category_ref_id is None:
+        item.category_ref = Category.objects.resolve(item.category)
+        RecurringTransaction.objects.filter(pk=item.pk).update(category_ref=item.category_ref)
+    category = _("Auto: %(category)s") % {'category': item.category}
+    return [
+        Transaction(
+            account=item.account, amount=item.amount, type=item.type,
+            category=category, category_ref_id=item.category_ref_id, date=_posted_at(day),
+        )
+        for day in days
+    ]
+
+
+@transaction.atomic
+def _post_batch(items, today):
+    new_transactions = []
+    accounts = set()
+    for item in items:
+        # Har bir element o'z savepoint'ida: bittasining muvaffaqiyatsizligi
+        # partiyadagi boshqa foydalanuvchilarning yozuvlarini qaytarmaydi.
+        try:
+            with transaction.atomic():
+                posted = _post_item(item, today)
+        except _Overdrawn:
+            # Mablag' yetmadi: da'vo ham qaytariladi, element keyingi ishga tushirishda qayta ko'riladi.
+            continue
+        if posted:
+            new_transactions.extend(posted)
+            accounts.add(item.account_id)
+    Transaction.objects.bulk_create(new_transactions)
+    stats.bump('total_transactions', len(new_transactions))
+    rollups.record(new_transactions)
+    versions.touch_owner(Account, pk__in=list(accounts))
+    return len(new_transactions)
@@ -0,0 +1,107 @@
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from . import money
+from .models import MonthlyCategorySpend, Transaction
+
+
+def record(transactions, sign=1):
+    totals = defaultdict(Decimal)
+    tz = timezone.get_current_timezone()
+    for t in transactions:
+        if t.type != 'EXPENSE':
+            continue
+        local = timezone.localtime(t.date, tz)
+        key = (t.account.user_id, local.year, local.month, t.category_ref_id, t.account.currency_id)
+        totals[key] += sign * t.amount
+    for key, amount in totals.items():
+        _add(key, amount)
+
+
+# Tahrirlash eski holatni ayirib, yangisini qo'shadi; o'chirish esa faqat ayiradi.
+def unrecord(transactions):
+    record(transactions, sign=-1)
+
+
+def _add(key, amount):
+    user_id, year, month, category_id, currency_id = key
+    lookup = {'user_id': user_id, 'year': year, 'month': month, 'category_id': category_id, 'currency_id': currency_id}
+    rows = MonthlyCategorySpend.objects.filter(**lookup)
+    if rows.update(amount=F('amount') + amount):
+        return
+    try:
+        with transaction.atomic():
+            MonthlyCategorySpend.objects.create(amount=amount, **lookup)
+    except IntegrityError:
+        # Parallel so'rov qatorni bizdan oldin yaratib ulgurdi.
+        rows.update(amount=F('amount') + amount)
+
+
+def closing_date(year, month):
+    # Oylik jamlanmalar oy oxiridagi kurs bilan (joriy oy uchun bugungi) konvertatsiya
+    # qilinadi, shuning uchun yopilgan oylar natijasi keyin o'zgarmaydi.
+    return min(date(year, month, monthrange(year, month)[1]), timezone.localdate())
+
+
+def spent(user, category_id, year, month, currency):
+    rows = MonthlyCategorySpend.objects.filter(user=user, year=year, month=month, category_id=category_id)
+    rows = list(rows)
+    return money.sum_converted([r.amount for r in rows], [r.currency_id for r in rows], currency, [closing_date(year, month)] * len(rows))
+
+
+def budget_rows(user, budgets):
+    if not budgets:
+        return MonthlyCategorySpend.objects.none()
+    match = reduce(or_, (Q(year=b.year, month=b.month, category_id=b.category_ref_id) for b in budgets))
+    return MonthlyCategorySpend.objects.filter(match, user=user)
+
+
+def spent_by_budget(budgets, rows):
+    by_key = defaultdict(list)
+    for r in rows:
+        by_key[(r.year, r.month, r.category_id)].append(r)
+    spent = {}
+    for b in budgets:
+        rows = by_key[(b.year, b.month, b.category_ref_id)]
+        spent[b.id] = money.sum_converted(
+            [r.amount for r in rows], [r.currency_id for r in rows], b.currency_id, [closing_date(b.year, b.month)] * len(rows),
+        )
+    return spent
+
+
+@transaction.atomic
+def rebuild(batch_size=1000, users=None):
+    # users berilsa faqat shu foydalanuvchilarning jadvali qayta quriladi.
+    spend = MonthlyCategorySpend.objects.all()
+    expenses = Transaction.objects.filter(type='EXPENSE')
+    if users is not None:
+        spend = spend.filter(user__in=users)
+        expenses = expenses.filter(account__user__in=users)
+    spend.delete()
+    rows = (
+        expenses
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values('account__user_id', 'year', 'month', 'category_ref_id', 'account__currency_id')
+        .annotate(total=Sum('amount'))
+        .order_by()
+    )
+    created = MonthlyCategorySpend.objects.bulk_create(
+        (
+            MonthlyCategorySpend(
+                user_id=row['account__user_id'], year=row['year'], month=row['month'],
+                category_id=row['category_ref_id'], currency_id=row['account__currency_id'], amount=row['total'],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=batch_size,
+    )
+    return len(created)
@@ -0,0 +1,96 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Transaction
+
+TABLE = 'configapp_transaction_search'
+TERM = re.compile(r'\w+')
+MAX_TERMS = 8
+RANKED_LIMIT = 20
+
+
+def terms(query):
+    return TERM.findall(query or '')[:MAX_TERMS]
+
+
+class LikeSearchBackend:
+    # Har qanday baza uchun zaxira variant: indeks ishlatmaydi, lekin
+    # FTS bo'lmagan bazalarda ham qidiruv ishlashi uchun kerak.
+    def filter(self, queryset, user, query):
+        for term in terms(query):
+            queryset = queryset.filter(Q(category__icontains=term) | Q(account__name__icontains=term))
+        return queryset
+
+    def ranked(self, user, query, limit=RANKED_LIMIT):
+        queryset = Transaction.objects.filter(account__user=user)
+        return list(self.filter(queryset, user, query).select_related('account__currency').order_by('-date', '-id')[:limit])
+
+    def rebuild(self):
+        return 0
+
+
+class SQLiteSearchBackend:
+    # FTS5 jadvali migratsiyadagi triggerlar orqali sinxron saqlanadi.
+    # Egasi "u<id>" tokeni sifatida indekslanadi, shunda MATCH faqat
+    # foydalanuvchining o'z yozuvlari bo'yicha yuradi.
+    def match(self, user, query):
+        words = terms(query)
+        if not words:
+            return None
+        return f'owner:"u{user.pk}" AND ' + ' '.join(f'"{word}"*' for word in words)
+
+    def filter(self, queryset, user, query):
+        expression = self.match(user, query)
+        if expression is None:
+            return queryset
+        return queryset.filter(id__in=RawSQL(f'SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s', [expression]))
+
+    def ranked(self, user, query, limit=RANKED_LIMIT):
+        expression = self.match(user, query)
+        if expression is None:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s ORDER BY rank LIMIT %s', [expression, limit])
+            ids = [row[0] for row in cursor.fetchall()]
+        found = Transaction.objects.select_related('account__currency').in_bulk(ids)
+        return [found[pk] for pk in ids if pk in found]
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE}')
+            cursor.execute(
+                f"INSERT INTO {TABLE} (rowid, owner, category, account) "
+                f"SELECT t.id, 'u' || a.user_id, t.category, a.name "
+                f"FROM configapp_transaction t JOIN configapp_account a ON a.id = t.account_id"
+            )
+            return cursor.rowcount
+
+
+@lru_cache(maxsize=None)
+def _backend_for(path):
+    return import_string(path)()
+
+
+def backend():
+    path = getattr(settings, 'TRANSACTION_SEARCH_BACKEND', None)
+    if path is None:
+        path = 'configapp.search.SQLiteSearchBackend' if connection.vendor == 'sqlite' else 'configapp.search.LikeSearchBackend'
+    return _backend_for(path)
+
+
+def filter_transactions(queryset, user, query):
+    return backend().filter(queryset, user, query)
+
+
+def ranked(user, query, limit=RANKED_LIMIT):
+    return backend().ranked(user, query, limit)
+
+
+def rebuild():
+    return backend().rebuild()
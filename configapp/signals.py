@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from . import authentication, rates, rollups, stats, versions
+from .models import Account, Budget, Currency, CurrencyRate, DataVersion, FinancialGoal, Transaction, User
+
+
+@receiver([post_save, post_delete], sender=Currency)
+@receiver([post_save, post_delete], sender=CurrencyRate)
+def invalidate_currency_rates(sender, **kwargs):
+    transaction.on_commit(rates.invalidate)
+
+
+@receiver(post_save, sender=Currency)
+def record_current_rate(sender, instance, **kwargs):
+    # Joriy kurs tahrirlanganda faqat bugungi sanadan boshlab amal qiladi.
+    CurrencyRate.objects.update_or_create(currency=instance, date=timezone.localdate(), defaults={'rate': instance.rate})
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Account)
+@receiver(post_save, sender=Transaction)
+def count_created(sender, instance, created, **kwargs):
+    if created and not getattr(instance, 'is_superuser', False):
+        stats.bump(stats.BY_MODEL[sender._meta.label])
+
+
+# Transaction uchun post_delete qo'shilmagan: u hisob/foydalanuvchi o'chirilganda
+# tranzaksiyalarni tezkor (bitta DELETE bilan) o'chirishni o'chirib qo'yardi.
+@receiver(post_save, sender=User)
+def create_data_version(sender, instance, created, **kwargs):
+    if created:
+        DataVersion.objects.get_or_create(user=instance)
+
+
+@receiver([post_save, post_delete], sender=Account)
+@receiver([post_save, post_delete], sender=Budget)
+@receiver([post_save, post_delete], sender=FinancialGoal)
+def touch_owner_version(sender, instance, **kwargs):
+    versions.touch(instance.user_id)
+
+
+# Hisob o'chirilganda tranzaksiyalar signalsiz (kaskad) o'chadi, egasi yoki valyutasi
+# o'zgarganda esa rollup kalitlari eskiradi: ikkala holatda egalar jadvali qayta quriladi.
+@receiver(pre_save, sender=Account)
+def remember_account_rollup_key(sender, instance, **kwargs):
+    instance._rollup_key = Account.objects.filter(pk=instance.pk).values_list('user_id', 'currency_id').first() if instance.pk else None
+
+
+@receiver(post_save, sender=Account)
+def rebuild_moved_account_rollups(sender, instance, **kwargs):
+    previous = getattr(instance, '_rollup_key', None)
+    if previous and previous != (instance.user_id, instance.currency_id):
+        rollups.rebuild(users={previous[0], instance.user_id})
+
+
+@receiver(post_delete, sender=Account)
+def rebuild_deleted_account_rollups(sender, instance, **kwargs):
+    rollups.rebuild(users=[instance.user_id])
+
+
+@receiver(post_save, sender=Transaction)
+def touch_account_owner_version(sender, instance, **kwargs):
+    versions.touch_owner(Account, pk=instance.account_id)
+
+
+# Keshlangan token autentifikatsiyasi: parol, is_active va boshqa o'zgarishlar
+# keyingi so'rovdayoq kuchga kiradi.
+@receiver(post_save, sender=User)
+def forget_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    # Har bir kirishda faqat last_login yangilanadi; bu keshga ta'sir qilmaydi.
+    if not created and update_fields != frozenset({'last_login'}):
+        authentication.forget_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    authentication.forget(instance.key)
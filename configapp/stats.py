@@ -0,0 +1,62 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from . import caching
+from .models import Account, Transaction, User
+
+PREFIX = 'admin_stats:'
+REFRESHED_AT = PREFIX + 'refreshed_at'
+
+COUNTERS = {
+    'total_users': lambda: User.objects.filter(is_superuser=False),
+    'total_accounts': lambda: Account.objects.all(),
+    'total_transactions': lambda: Transaction.objects.all(),
+}
+# Model nomi (delete() natijasidagi kalit ham shu) -> hisoblagich.
+BY_MODEL = {
+    User._meta.label: 'total_users',
+    Account._meta.label: 'total_accounts',
+    Transaction._meta.label: 'total_transactions',
+}
+
+
+def refresh_interval():
+    return getattr(settings, 'ADMIN_STATS_REFRESH_INTERVAL', 300)
+
+
+def refresh():
+    values = {name: queryset().count() for name, queryset in COUNTERS.items()}
+    # Umumiy keshda: bump() qaysi worker'da bo'lmasin, admin panel bir xil sonni ko'radi.
+    cache = caching.shared_or_default()
+    cache.set_many({PREFIX + name: value for name, value in values.items()}, timeout=None)
+    cache.set(REFRESHED_AT, time.time(), timeout=None)
+    return values
+
+
+def snapshot():
+    keys = [PREFIX + name for name in COUNTERS]
+    stored = caching.shared_or_default().get_many(keys + [REFRESHED_AT])
+    # Hisoblagichlar yozuvlar bilan birga oshiriladi; vaqti-vaqti bilan qayta
+    # sanash admin panel yoki bulk yo'llar orqali yuzaga kelgan farqni tuzatadi.
+    if len(stored) < len(keys) + 1 or time.time() - stored[REFRESHED_AT] > refresh_interval():
+        return refresh()
+    return {name: stored[PREFIX + name] for name in COUNTERS}
+
+
+def bump(name, delta=1):
+    def apply():
+        try:
+            caching.shared_or_default().incr(PREFIX + name, delta)
+        except ValueError:
+            # Kalit hali yo'q: keyingi snapshot() uni bazadan sanaydi.
+            pass
+    if delta:
+        transaction.on_commit(apply)
+
+
+def record_deleted(per_model):
+    for label, count in per_model.items():
+        if label in BY_MODEL:
+            bump(BY_MODEL[label], -count)
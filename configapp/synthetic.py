@@ -0,0 +1,104 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from . import rates, rollups, stats
+from .models import (
+    Account, Budget, Category, Currency, DataVersion, FinancialGoal, RecurringTransaction, Transaction, User,
+)
+
+EXPENSE_CATEGORIES = ['Food', 'Taxi', 'Rent', 'Coffee', 'Utilities', 'Health', 'Books', 'Gym', 'Travel', 'Gifts']
+INCOME_CATEGORIES = ['Salary', 'Stipend', 'Freelance']
+DEFAULT_CURRENCIES = [('UZS', Decimal('1')), ('USD', Decimal('12800')), ('EUR', Decimal('13900'))]
+HISTORY_DAYS = 365
+PASSWORD = 'synthetic'
+
+
+def _currencies():
+    currencies = list(Currency.objects.order_by('id'))
+    if currencies:
+        return currencies
+    for code, rate in DEFAULT_CURRENCIES:
+        Currency.objects.create(code=code, name=code, rate=rate)
+    return list(Currency.objects.order_by('id'))
+
+
+def _amount(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)).scaleb(-2)
+
+
+@transaction.atomic
+def generate(users=10, accounts=3, transactions=10000, seed=0, batch_size=5000):
+    # Hammasi bulk_create orqali yoziladi: signal va ledger chetlab o'tiladi, shuning
+    # uchun balanslar, versiyalar, rollup va stats shu yerning o'zida to'g'rilanadi.
+    rng = random.Random(seed)
+    tag = uuid4().hex[:8]
+    now = timezone.now()
+    currencies = _currencies()
+    category_ids = Category.objects.resolve_many(EXPENSE_CATEGORIES + INCOME_CATEGORIES)
+    password = make_password(PASSWORD)
+
+    created_users = User.objects.bulk_create(
+        User(email=f'synthetic-{tag}-{i}@example.invalid', username=f'synthetic-{tag}-{i}', password=password)
+        for i in range(users)
+    )
+    DataVersion.objects.bulk_create(DataVersion(user=user) for user in created_users)
+    created_accounts = Account.objects.bulk_create(
+        Account(user=user, name=f'Account {i + 1}', type=rng.choice(['CASH', 'CARD']), balance=0, currency=rng.choice(currencies))
+        for user in created_users for i in range(accounts)
+    )
+
+    deltas = dict.fromkeys((account.id for account in created_accounts), Decimal('0'))
+    expenses = dict(deltas)
+    remaining = transactions
+    while remaining > 0:
+        chunk = []
+        for _ in range(min(batch_size, remaining)):
+            account = rng.choice(created_accounts)
+            if rng.random() < 0.8:
+                t_type, category, amount = 'EXPENSE', rng.choice(EXPENSE_CATEGORIES), _amount(rng, 1, 500)
+                expenses[account.id] += amount
+            else:
+                t_type, category, amount = 'INCOME', rng.choice(INCOME_CATEGORIES), _amount(rng, 100, 3000)
+            deltas[account.id] += amount if t_type == 'INCOME' else -amount
+            chunk.append(Transaction(
+                account=account, amount=amount, type=t_type, category=category, category_ref_id=category_ids[category],
+                date=now - timedelta(seconds=rng.randint(0, HISTORY_DAYS * 86400)),
+            ))
+        Transaction.objects.bulk_create(chunk, batch_size=batch_size)
+        remaining -= len(chunk)
+
+    # Boshlang'ich balans xarajatlarni qoplaydi, shunda hech bir hisob manfiy bo'lmaydi.
+    for account in created_accounts:
+        account.balance = expenses[account.id] + deltas[account.id] + _amount(rng, 0, 1000)
+    Account.objects.bulk_update(created_accounts, ['balance'], batch_size=batch_size)
+
+    Budget.objects.bulk_create(
+        Budget(user=user, name='MONTHLY', category=category, category_ref_id=category_ids[category],
+               amount_limit=_amount(rng, 500, 5000), currency=rng.choice(currencies), month=now.month, year=now.year)
+        for user in created_users for category in rng.sample(EXPENSE_CATEGORIES, 3)
+    )
+    FinancialGoal.objects.bulk_create(
+        FinancialGoal(user=user, title=f'Goal {i + 1}', target_amount=_amount(rng, 1000, 20000),
+                      current_amount=_amount(rng, 0, 1000), currency=rng.choice(currencies))
+        for user in created_users for i in range(2)
+    )
+    user_accounts = [created_accounts[i:i + accounts] for i in range(0, len(created_accounts), accounts)]
+    RecurringTransaction.objects.bulk_create(
+        RecurringTransaction(account=rng.choice(owned), amount=_amount(rng, 10, 200), type='EXPENSE', category=category,
+                             category_ref_id=category_ids[category], frequency=rng.choice(['WEEKLY', 'MONTHLY']),
+                             next_date=(now + timedelta(days=rng.randint(1, 30))).date())
+        for owned in user_accounts for category in rng.sample(EXPENSE_CATEGORIES, 2)
+    )
+
+    rollups.rebuild(batch_size=batch_size, users=created_users)
+    # Valyutalar shu tranzaksiyada yaratilgan bo'lishi mumkin: kesh darhol va commit'dan keyin yangilanadi.
+    rates.invalidate()
+    transaction.on_commit(rates.invalidate)
+    transaction.on_commit(stats.refresh)
+    return {'users': created_users, 'accounts': len(created_accounts), 'transactions': transactions}
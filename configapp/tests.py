@@ -1,3 +1,1096 @@
-from django.test import TestCase
+import io
+import json
+import re
+import tempfile
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import skipUnless
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import mail
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.db.models import Sum
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from . import admin_lists, caching, dashboard, exporters, importers, ledger, money, outbox, rates, recurring, rollups, search, stats, synthetic, throttling, views
+from .models import User, Currency, Account, Transaction, RecurringTransaction, Budget, MonthlyCategorySpend, ResetCode, Category, FinancialGoal, OutboxEmail, CurrencyRate, DataVersion
+from .pagination import ADMIN_USERS_PAGE_SIZE
+from .serializers import AccountSerializer, GoalSerializer, TransactionSerializer
+from .throttling import rates as throttle_rates
+
+
+# Testlar var/ ostidagi haqiqiy keshlarga tegmaydi: har bir alias o'z LocMem'ida,
+# sozlamalardagi OPTIONS (MAX_ENTRIES va h.k.) saqlanadi.
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'test-{alias}', 'OPTIONS': config.get('OPTIONS', {})}
+    for alias, config in settings.CACHES.items()
+}
+process_local_shared = caching.shared
+
+
+@override_settings(CACHES=TEST_CACHES)
+class LedgerTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.uzs = Currency.objects.create(code='UZS', name='Uzbek soʻm', symbol='soʻm', rate=Decimal('1'))
+        cls.usd = Currency.objects.create(code='USD', name='US Dollar', symbol='$', rate=Decimal('12800'))
+        cls.user = User.objects.create_user(email='user@example.com', password='secret', username='user@example.com')
+        cls.cash = Account.objects.create(user=cls.user, name='Cash', type='CASH', balance=Decimal('100000'), currency=cls.uzs)
+        cls.card = Account.objects.create(user=cls.user, name='Card', type='CARD', balance=Decimal('10'), currency=cls.usd)
+
+    def setUp(self):
+        for store in caches.all():
+            store.clear()
+        # Test jarayoni yagona worker: LocMem ham umumiy kesh vazifasini bajaradi.
+        shared = patch.object(caching, 'shared', lambda: caches[caching.ALIAS])
+        shared.start()
+        self.addCleanup(shared.stop)
+        rates.invalidate()
+        self.client.force_login(self.user)
+
+
+class HomeViewTests(LedgerTestCase):
+    def test_totals_are_converted_to_selected_currency(self):
+        Transaction.objects.create(account=self.cash, amount=Decimal('25600'), type='EXPENSE', category='Food')
+        Transaction.objects.create(account=self.card, amount=Decimal('1'), type='EXPENSE', category='Food')
+        Transaction.objects.create(account=self.card, amount=Decimal('2'), type='EXPENSE', category='Taxi')
+        Transaction.objects.create(account=self.card, amount=Decimal('5'), type='INCOME', category='Salary')
+        response = self.client.get(reverse('home'), {'currency': 'USD'})
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(float(response.context['total']), 100000 / 12800 + 10, places=2)
+        totals = dict(zip(response.context['chart_labels'], response.context['chart_data']))
+        self.assertEqual(totals, {'Food': 3.0, 'Taxi': 2.0})
+
+    def test_query_count_does_not_grow_with_ledger(self):
+        def count_queries():
+            caches['shared'].clear()
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(reverse('home'))
+            return len(ctx.captured_queries)
+
+        Transaction.objects.create(account=self.cash, amount=Decimal('1'), type='EXPENSE', category='Food')
+        count_queries()
+        baseline = count_queries()
+        Transaction.objects.bulk_create(
+            Transaction(account=account, amount=Decimal('1'), type='EXPENSE', category='Category %d' % i)
+            for i in range(50) for account in (self.cash, self.card)
+        )
+        self.assertEqual(count_queries(), baseline)
+
+    def test_repeat_loads_are_served_from_cache(self):
+        self.client.get(reverse('home'))
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, 'id="chart-labels"')
+
+    def test_writes_and_rate_changes_invalidate_cache(self):
+        def totals(currency='UZS'):
+            response = self.client.get(reverse('home'), {'currency': currency})
+            return response.context['total'], response.context['chart_labels']
+
+        self.assertEqual(totals(), (Decimal('228000'), []))
+        self.client.post(reverse('add_transaction'), {'account': self.cash.id, 'amount': '1000', 'type': 'EXPENSE', 'category': 'Food'})
+        self.assertEqual(totals(), (Decimal('227000'), ['Food']))
+        self.assertEqual(totals('USD')[1], ['Food'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usd.rate = Decimal('12000')
+            self.usd.save()
+        self.assertEqual(totals()[0], Decimal('219000'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('add_goal'), {'title': 'Car', 'target': '100', 'currency': self.uzs.id})
+        self.assertEqual([goal.title for goal in self.client.get(reverse('home')).context['goals']], ['Car'])
+
+
+class DashboardDataTests(LedgerTestCase):
+    def sync(self, since=None):
+        params = {'since': since} if since else {}
+        return self.client.get(reverse('dashboard_data'), params).json()
+
+    def test_first_sync_is_full_then_empty(self):
+        FinancialGoal.objects.create(user=self.user, title='Car', target_amount=Decimal('100'), current_amount=Decimal('25'), currency=self.uzs)
+        data = self.sync()
+        self.assertTrue(data['full'])
+        self.assertEqual(data['total'], '228000.00')
+        self.assertEqual([goal['percent'] for goal in data['goals']['changed'].values()], [25])
+        with self.assertNumQueries(3):
+            self.assertEqual(self.sync(data['cursor']), {'cursor': data['cursor'], 'full': False})
+
+    def test_returns_only_changed_sections_and_keys(self):
+        Transaction.objects.create(account=self.cash, amount=Decimal('10'), type='EXPENSE', category='Taxi')
+        data = self.sync()
+        self.client.post(reverse('add_transaction'), {'account': self.cash.id, 'amount': '1000', 'type': 'EXPENSE', 'category': 'Food'})
+        # Keyingi so'rovni boshqa worker qabul qilgandek: jarayon ichidagi kesh bo'sh.
+        caches['default'].clear()
+        delta = self.sync(data['cursor'])
+        self.assertFalse(delta['full'])
+        self.assertEqual(set(delta) - {'cursor', 'full'}, {'total', 'category_totals'})
+        self.assertEqual(delta['category_totals'], {'changed': {'Food': 1000.0}, 'removed': []})
+        self.assertTrue(self.sync('0.stale.UZS.2000-01')['full'])
+
+
+class ConditionalGetTests(LedgerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_unchanged_api_poll_is_not_modified(self):
+        first = self.api.get(reverse('api_accounts'))
+        with self.assertNumQueries(1):
+            second = self.api.get(reverse('api_accounts'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((second.status_code, second['ETag']), (304, first['ETag']))
+        self.assertTrue(second.has_header('Last-Modified'))
+
+        self.api.post(reverse('api_transactions'), {'account': self.cash.id, 'amount': '5', 'type': 'INCOME', 'category': 'Gift'})
+        third = self.api.get(reverse('api_accounts'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.api.post(reverse('api_goals'), {'title': 'Car', 'target_amount': '10', 'currency': self.usd.id})
+        self.assertEqual(self.api.get(reverse('api_transactions'), HTTP_IF_NONE_MATCH=third['ETag']).status_code, 200)
+        fourth = self.api.get(reverse('api_transactions'))
+        self.assertNotEqual(fourth['ETag'], third['ETag'])
+        importers.import_transactions(self.user, io.BytesIO(b'account,amount,type,category\nCash,1,EXPENSE,Food\n'))
+        self.assertEqual(self.api.get(reverse('api_transactions'), HTTP_IF_NONE_MATCH=fourth['ETag']).status_code, 200)
+
+    def test_last_modified_alone_and_other_pages_are_never_not_modified(self):
+        first = self.api.get(reverse('api_transactions'))
+        self.assertEqual(self.api.get(reverse('api_transactions'), HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, 200)
+        filtered = self.api.get(reverse('api_transactions'), {'type': 'INCOME'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(filtered.status_code, 200)
+        self.assertNotEqual(filtered['ETag'], first['ETag'])
+        self.assertEqual(self.api.get(reverse('api_transactions'), {'type': 'INCOME'}, HTTP_IF_NONE_MATCH=filtered['ETag']).status_code, 304)
+
+    def test_home_revalidates_but_never_swallows_messages(self):
+        etag = self.client.get(reverse('home'))['ETag']
+        self.assertEqual(self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(reverse('home'), {'currency': 'USD'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        response = self.client.post(reverse('add_transaction'), {
+            'account': self.card.id, 'amount': '500', 'type': 'EXPENSE', 'category': 'Food',
+        }, follow=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Mablag' yetarli emas!", [str(m) for m in response.context['messages']])
+        self.client.post(reverse('add_transaction'), {'account': self.card.id, 'amount': '1', 'type': 'EXPENSE', 'category': 'Food'})
+        self.assertEqual(self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class AsyncViewTests(LedgerTestCase):
+    async def test_async_views_render_under_async_client(self):
+        await self.async_client.aforce_login(self.user)
+        for name in ('home', 'budget_list', 'history'):
+            response = await self.async_client.get(reverse(name))
+            self.assertEqual(response.status_code, 200, name)
+
+    async def test_cold_worker_loads_rates_outside_event_loop(self):
+        now = timezone.now()
+        await Budget.objects.acreate(user=self.user, name='MONTHLY', category='Food', amount_limit=Decimal('100'),
+                                     currency=self.usd, month=now.month, year=now.year)
+        spent = await Transaction.objects.acreate(account=self.cash, amount=Decimal('12800'), type='EXPENSE', category='Food')
+        await sync_to_async(rollups.record)([spent])
+        await self.async_client.aforce_login(self.user)
+        for name in ('budget_list', 'home'):
+            rates._state = {'version': None}
+            response = await self.async_client.get(reverse(name))
+            self.assertEqual(response.status_code, 200, name)
+
+    async def test_rates_version_is_not_read_on_event_loop(self):
+        spent = await Transaction.objects.acreate(account=self.card, amount=Decimal('1'), type='EXPENSE', category='Food')
+        await sync_to_async(rollups.record)([spent])
+        await self.async_client.aforce_login(self.user)
+        on_loop = []
+        read_version = rates._shared_version
+
+        def tracked():
+            on_loop.append(rates._in_event_loop())
+            return read_version()
+
+        with patch.object(rates, '_shared_version', tracked):
+            for name in ('home', 'budget_list', 'dashboard_data'):
+                await caching.shared_or_default().aclear()
+                response = await self.async_client.get(reverse(name), {'currency': 'USD'})
+                self.assertEqual(response.status_code, 200, name)
+        self.assertTrue(on_loop)
+        self.assertNotIn(True, on_loop)
+
+    async def test_anonymous_user_is_redirected(self):
+        response = await self.async_client.get(reverse('home'))
+        self.assertEqual(response.status_code, 302)
+
+class RecurringSchedulerTests(LedgerTestCase):
+    def test_catches_up_missed_periods_once(self):
+        today = timezone.now().date()
+        item = RecurringTransaction.objects.create(
+            account=self.cash, amount=Decimal('1000'), type='INCOME', category='Salary',
+            frequency='WEEKLY', next_date=today - timedelta(days=20),
+        )
+        self.assertEqual(recurring.post_due(today=today), 3)
+        self.assertEqual(recurring.post_due(today=today), 0)
+        item.refresh_from_db()
+        self.cash.refresh_from_db()
+        self.assertEqual(item.next_date, today + timedelta(days=1))
+        self.assertEqual(self.cash.balance, Decimal('103000'))
+        self.assertEqual(Transaction.objects.filter(account=self.cash, type='INCOME').count(), 3)
+
+    def test_expense_stops_when_funds_run_out(self):
+        today = timezone.now().date()
+        start = today - timedelta(days=14)
+        item = RecurringTransaction.objects.create(
+            account=self.card, amount=Decimal('4'), type='EXPENSE', category='Gym',
+            frequency='WEEKLY', next_date=start,
+        )
+        self.assertEqual(recurring.post_due(today=today), 2)
+        item.refresh_from_db()
+        self.card.refresh_from_db()
+        self.assertEqual(item.next_date, start + timedelta(days=14))
+        self.assertEqual(self.card.balance, Decimal('2'))
+
+    def test_stale_batch_only_skips_the_failing_item(self):
+        today = timezone.now().date()
+
+        def make(account, amount, t_type):
+            return RecurringTransaction.objects.create(
+                account=account, amount=Decimal(amount), type=t_type, category='Rent', frequency='MONTHLY', next_date=today,
+            )
+
+        salary, taken, rent, gym = make(self.cash, '500', 'INCOME'), make(self.card, '3', 'EXPENSE'), make(self.card, '4', 'EXPENSE'), make(self.card, '5', 'EXPENSE')
+        batch = list(RecurringTransaction.objects.select_related('account').order_by('id'))
+        # Partiya o'qilgandan keyin: boshqa ishchi bitta elementni o'tkazdi, balans esa kamaydi.
+        RecurringTransaction.objects.filter(pk=taken.pk).update(next_date=today + timedelta(days=30))
+        Account.objects.filter(pk=self.card.pk).update(balance=Decimal('6'))
+        self.assertEqual(recurring._post_batch(batch, today), 2)
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, Decimal('2'))
+        self.assertEqual(
+            dict(RecurringTransaction.objects.values_list('pk', 'next_date')),
+            {salary.pk: today + timedelta(days=30), taken.pk: today + timedelta(days=30), rent.pk: today + timedelta(days=30), gym.pk: today},
+        )
+
+
+class RollupTests(LedgerTestCase):
+    def add(self, account, amount, category, t_type='EXPENSE'):
+        return self.client.post(reverse('add_transaction'), {
+            'account': account.id, 'amount': amount, 'type': t_type, 'category': category,
+        }, follow=True)
+
+    def test_writes_update_rollup_and_budget_views(self):
+        now = timezone.now()
+        Budget.objects.create(user=self.user, name='MONTHLY', category='food', amount_limit=Decimal('30000'),
+                              currency=self.uzs, month=now.month, year=now.year)
+        self.add(self.cash, '12800', 'Food')
+        self.add(self.card, '1', 'FOOD')
+        self.add(self.card, '5', 'Salary', 'INCOME')
+        row = MonthlyCategorySpend.objects.get(user=self.user, currency=self.usd)
+        self.assertEqual((row.category.key, row.amount), ('food', Decimal('1')))
+
+        response = self.add(self.cash, '5000', 'Food')
+        self.assertIn('byudjet limitidan', ' '.join(str(m) for m in response.context['messages']))
+
+        response = self.client.get(reverse('budget_list'))
+        item = response.context['budget_data'][0]
+        self.assertEqual(item['total_spent'], Decimal('30600.00'))
+        self.assertEqual(len(item['transactions']), 3)
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self.add(self.cash, '100', 'Food')
+        self.add(self.card, '2', 'Taxi')
+        self.add(self.card, '3', 'taxi')
+        incremental = set(MonthlyCategorySpend.objects.values_list('category', 'currency_id', 'amount'))
+        self.assertEqual(rollups.rebuild(), 2)
+        self.assertEqual(set(MonthlyCategorySpend.objects.values_list('category', 'currency_id', 'amount')), incremental)
+
+    def test_unknown_type_is_not_posted(self):
+        response = self.add(self.cash, '100', 'Food', 'GIFT')
+        self.assertIn("turi noto'g'ri", ' '.join(str(m) for m in response.context['messages']))
+        self.cash.refresh_from_db()
+        self.assertEqual(self.cash.balance, Decimal('100000'))
+        self.assertFalse(Transaction.objects.exists())
+
+    def spend(self):
+        return set(MonthlyCategorySpend.objects.exclude(amount=0).values_list('category__key', 'currency_id', 'amount'))
+
+    def test_api_update_and_delete_adjust_rollup(self):
+        # urls.py'da detail marshrutlar yo'q, shuning uchun viewset to'g'ridan-to'g'ri chaqiriladi.
+        detail = views.TransactionViewSet.as_view({'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'})
+        factory = APIRequestFactory()
+
+        def call(method, pk, data=None):
+            request = getattr(factory, method)('/', data, format='json')
+            force_authenticate(request, self.user)
+            return detail(request, pk=pk)
+
+        self.add(self.cash, '100', 'Food')
+        pk = Transaction.objects.get().pk
+        self.assertEqual(call('patch', pk, {'amount': '70', 'category': 'Taxi'}).status_code, 200)
+        self.assertEqual(self.spend(), {('taxi', self.uzs.id, Decimal('70'))})
+        call('put', pk, {'account': self.card.id, 'amount': '2', 'type': 'EXPENSE', 'category': 'Taxi'})
+        self.assertEqual(self.spend(), {('taxi', self.usd.id, Decimal('2'))})
+        self.assertEqual(call('delete', pk).status_code, 204)
+        self.assertEqual(self.spend(), set())
+
+    def test_admin_edit_and_delete_adjust_rollup(self):
+        self.add(self.cash, '100', 'Food')
+        removed = Transaction.objects.get()
+        self.client.force_login(User.objects.create_superuser(email='admin@example.com', password='secret', username='admin'))
+        kept = Transaction.objects.create(account=self.cash, amount=Decimal('5'), type='EXPENSE', category='Food')
+        rollups.record([kept])
+        change = reverse('admin:configapp_transaction_change', args=[removed.pk])
+        self.client.post(change, {'account': self.cash.id, 'amount': '40', 'type': 'EXPENSE', 'category': 'Food',
+                                  'date_0': removed.date.strftime('%Y-%m-%d'), 'date_1': removed.date.strftime('%H:%M:%S')})
+        self.assertEqual(self.spend(), {('food', self.uzs.id, Decimal('45'))})
+        self.client.post(reverse('admin:configapp_transaction_delete', args=[removed.pk]), {'post': 'yes'})
+        self.assertEqual(self.spend(), {('food', self.uzs.id, Decimal('5'))})
+        self.client.post(reverse('admin:configapp_transaction_changelist'), {'action': 'delete_selected', '_selected_action': [kept.pk], 'post': 'yes'})
+        self.assertEqual(self.spend(), set())
+
+    def test_account_delete_and_move_rebuild_rollup(self):
+        self.add(self.cash, '40', 'Food')
+        self.add(self.card, '2', 'Taxi')
+        self.cash.currency = self.usd
+        self.cash.save()
+        self.assertEqual(self.spend(), {('food', self.usd.id, Decimal('40')), ('taxi', self.usd.id, Decimal('2'))})
+        self.cash.delete()
+        self.assertEqual(self.spend(), {('taxi', self.usd.id, Decimal('2'))})
+
+    def test_recurring_postings_count_towards_base_category_budget(self):
+        today = timezone.localdate()
+        budget = Budget.objects.create(user=self.user, name='MONTHLY', category='Rent ', amount_limit=Decimal('1000'),
+                                       currency=self.uzs, month=today.month, year=today.year)
+        RecurringTransaction.objects.create(account=self.cash, amount=Decimal('700'), type='EXPENSE', category='rent',
+                                            frequency='MONTHLY', next_date=today)
+        recurring.post_due(today=today)
+        posted = Transaction.objects.get(account=self.cash)
+        self.assertTrue(posted.category.startswith('Auto:'))
+        self.assertEqual(posted.category_ref_id, budget.category_ref_id)
+        self.assertEqual(Category.objects.filter(key='rent').count(), 1)
+        self.assertEqual(rollups.spent(self.user, budget.category_ref_id, today.year, today.month, self.uzs), Decimal('700'))
+
+
+class MoneyTests(LedgerTestCase):
+    def test_minor_units_round_half_even(self):
+        self.assertEqual([money.to_minor(Decimal(v)) for v in ('0.125', '0.135', '-0.125', '7')], [12, 14, -12, 700])
+        self.assertEqual(str(money.from_minor(-5)), '-0.05')
+        self.assertEqual(money.convert(Decimal('0.01'), self.uzs, self.usd), Decimal('0.00'))
+        self.assertEqual(money.convert(Decimal('64'), self.uzs, self.usd), Decimal('0.00'))
+        self.assertEqual(money.convert(Decimal('192'), self.uzs, self.usd), Decimal('0.02'))
+        self.assertEqual(money.convert(Decimal('320'), self.uzs, self.usd), Decimal('0.02'))
+
+    def test_total_converts_each_currency_sum_once(self):
+        units = [128] * 100 + [100]
+        sources = [self.uzs.id] * 100 + [self.usd.id]
+        self.assertEqual(money.total(units, sources, self.usd.id), 101)
+        self.assertEqual(sum(money.convert_many(units, sources, self.usd.id)), 100)
+
+    @skipUnless(money.np is not None, 'NumPy is not installed')
+    def test_numpy_path_matches_python_path(self):
+        units = [(i * 7919) % 200001 - 100000 for i in range(money.NUMPY_MIN_ROWS * 2)]
+        sources = [(self.uzs.id, self.usd.id)[i % 2] for i in range(len(units))]
+        with patch.object(money, 'np', None):
+            expected = (money.convert_many(units, sources, self.usd.id), money.total(units, sources, self.usd.id))
+        self.assertEqual((money.convert_many(units, sources, self.usd.id), money.total(units, sources, self.usd.id)), expected)
+        huge = [10 ** 20] * money.NUMPY_MIN_ROWS
+        self.assertEqual(money.convert_many(huge, [self.usd.id] * len(huge), self.uzs.id)[0], 128 * 10 ** 22)
+
+
+class RateHistoryTests(LedgerTestCase):
+    def test_past_spending_keeps_rate_of_its_date(self):
+        today = timezone.localdate()
+        CurrencyRate.objects.create(currency=self.usd, date=today - timedelta(days=40), rate=Decimal('10000'))
+        rates.invalidate()
+        Transaction.objects.create(account=self.card, amount=Decimal('1'), type='EXPENSE', category='Old', date=timezone.now() - timedelta(days=30))
+        Transaction.objects.create(account=self.card, amount=Decimal('1'), type='EXPENSE', category='New')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usd.rate = Decimal('13000')
+            self.usd.save()
+        totals = dashboard.category_totals(dashboard.category_rows(self.user), self.uzs)
+        self.assertEqual(totals, {'New': Decimal('13000.00'), 'Old': Decimal('10000.00')})
+        self.assertEqual(money.convert(Decimal('1'), self.usd, self.uzs, on=today - timedelta(days=400)), Decimal('10000.00'))
+
+    def test_spend_is_grouped_by_rate_period_and_rates_read_once(self):
+        CurrencyRate.objects.create(currency=self.usd, date=timezone.localdate() - timedelta(days=40), rate=Decimal('10000'))
+        rates.invalidate()
+        food, now = Category.objects.resolve('Food'), timezone.now()
+        Transaction.objects.bulk_create(
+            Transaction(account=self.card, amount=Decimal('1'), type='EXPENSE', category='Food', category_ref=food, date=now - timedelta(days=day))
+            for day in range(60)
+        )
+        rows = list(dashboard.category_rows(self.user))
+        # 60 kun o'rniga uch davr: tarixdan oldin, 40 kun oldingi kurs va bugungi (joriy) kurs.
+        self.assertEqual(len(rows), 3)
+        with patch.object(rates, '_shared_version', wraps=rates._shared_version) as version:
+            self.assertEqual(dashboard.category_totals(rows, self.uzs), {'Food': Decimal('602800.00')})
+        self.assertEqual(version.call_count, 1)
+
+    def test_load_rates_command_upserts_and_syncs_current_rate(self):
+        today = timezone.localdate()
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'rates.csv'
+        path.write_text(
+            'code,date,rate\n'
+            f'USD,{today - timedelta(days=1)},12500\n'
+            f'usd,{today},12900\n'
+            f'USD,{today + timedelta(days=1)},13100\n'
+            'EUR,2024-01-01,14000\n'
+            f'USD,not-a-date,1\n'
+            + ''.join(f'USD,2020-01-0{day},{rate}\n' for day, rate in enumerate(('0', '-5', 'NaN', 'inf', '1' + '0' * 14), start=1))
+        )
+        out = io.StringIO()
+        call_command('load_rates', str(path), stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual((report['loaded'], [e['line'] for e in report['errors']]), (3, [5, 6, 7, 8, 9, 10, 11]))
+        self.assertEqual(CurrencyRate.objects.filter(currency=self.usd).count(), 3)
+        self.usd.refresh_from_db()
+        self.assertEqual(self.usd.rate, Decimal('12900'))
+        self.assertEqual(money.convert(Decimal('1'), self.usd, self.uzs, on=today - timedelta(days=1)), Decimal('12500.00'))
+
+
+class CurrencyRateCacheTests(LedgerTestCase):
+    def test_conversions_are_served_from_memory(self):
+        money.convert(Decimal('1'), self.usd, self.uzs)
+        with self.assertNumQueries(0):
+            self.assertEqual(money.convert(Decimal('2'), self.usd, self.uzs), Decimal('25600'))
+            self.assertEqual(rates.resolve('EUR'), self.uzs)
+
+    def test_admin_rate_edit_invalidates_cache(self):
+        self.assertEqual(money.convert(Decimal('1'), self.usd.id, self.uzs.id), Decimal('12800'))
+        admin = User.objects.create_superuser(email='admin@example.com', password='secret', username='admin')
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('admin:configapp_currency_changelist'), {
+                'form-TOTAL_FORMS': '2', 'form-INITIAL_FORMS': '2',
+                'form-0-id': self.uzs.id, 'form-0-rate': '1',
+                'form-1-id': self.usd.id, 'form-1-rate': '13000',
+                '_save': 'Save',
+            })
+        self.assertEqual(money.convert(Decimal('1'), self.usd.id, self.uzs.id), Decimal('13000'))
+
+    def test_version_is_shared_between_workers(self):
+        money.convert(Decimal('1'), self.usd, self.uzs)
+        Currency.objects.filter(pk=self.usd.pk).update(rate=Decimal('13000'))
+        # Boshqa worker kursni o'zgartirdi: uning LocMem keshi bu jarayonga ko'rinmaydi, umumiy kesh esa ko'rinadi.
+        caches['shared'].set(rates.VERSION_KEY, 'other-worker', timeout=None)
+        self.assertEqual(money.convert(Decimal('1'), self.usd, self.uzs), Decimal('13000'))
+
+    def test_non_positive_rate_is_rejected_and_isolated(self):
+        with self.assertRaises(ValidationError):
+            Currency(code='XXX', rate=Decimal('0')).full_clean()
+        broken = Currency.objects.create(code='XXX', rate=Decimal('1'))
+        Currency.objects.filter(pk=broken.pk).update(rate=Decimal('0'))
+        rates.invalidate()
+        self.assertEqual(money.convert(Decimal('1'), self.usd, self.uzs), Decimal('12800'))
+
+
+class TransactionPaginationTests(LedgerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        same_moment = timezone.now()
+        Transaction.objects.bulk_create(
+            Transaction(account=cls.cash, amount=Decimal(i + 1), type='EXPENSE', category='Food', date=same_moment)
+            for i in range(120)
+        )
+
+    def test_history_pages_walk_every_row_once(self):
+        seen = []
+        cursor = None
+        while True:
+            response = self.client.get(reverse('history'), {'cursor': cursor} if cursor else {})
+            seen.extend(t.id for t in response.context['transactions'])
+            cursor = response.context['next_cursor']
+            if not cursor:
+                break
+            # Yangi yozuvlar allaqachon ko'rilgan sahifalarni siljitmasligi kerak.
+            Transaction.objects.create(account=self.cash, amount=Decimal('1'), type='EXPENSE', category='Food')
+        self.assertEqual(len(seen), 120)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_api_uses_cursor_pagination(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=self.user).key)
+        response = client.get(reverse('api_transactions'))
+        self.assertEqual(len(response.data['results']), 50)
+        self.assertIn('cursor=', response.data['next'])
+        response = client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 50)
+
+    def test_api_cursor_walks_same_date_rows_without_offset(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        seen = []
+        url = reverse('api_transactions') + '?page_size=7'
+        with CaptureQueriesContext(connection) as ctx:
+            while url:
+                response = client.get(url)
+                seen.extend(row['id'] for row in response.data['results'])
+                url = response.data['next']
+        self.assertEqual(len(seen), 120)
+        self.assertEqual(seen, sorted(set(seen), reverse=True))
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if 'OFFSET' in q['sql']])
+
+
+@skipUnless(connection.vendor == 'sqlite', "FTS5 indeksi faqat SQLite'da")
+class SearchTests(LedgerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def ids(self, response):
+        return [row['id'] for row in response.json()['results']]
+
+    def test_prefix_match_on_category_and_account(self):
+        food = Transaction.objects.create(account=self.cash, amount=Decimal('1'), type='EXPENSE', category='Oziq-ovqat')
+        taxi = Transaction.objects.create(account=self.card, amount=Decimal('1'), type='EXPENSE', category='Taxi')
+        other = User.objects.create_user(email='other@example.com', password='secret', username='other')
+        wallet = Account.objects.create(user=other, name='Cash', type='CASH', balance=0, currency=self.uzs)
+        Transaction.objects.create(account=wallet, amount=Decimal('1'), type='EXPENSE', category='Oziq')
+        self.assertEqual(self.ids(self.api.get(reverse('api_transactions'), {'search': 'ozi'})), [food.id])
+        self.assertEqual(self.ids(self.api.get(reverse('api_transactions'), {'search': 'car'})), [taxi.id])
+        response = self.client.get(reverse('history'), {'search': 'TAX'})
+        self.assertEqual([t.id for t in response.context['transactions']], [taxi.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        t = Transaction.objects.create(account=self.cash, amount=Decimal('1'), type='EXPENSE', category='Kino')
+        t.category = 'Teatr'
+        t.save()
+        self.assertEqual(self.ids(self.api.get(reverse('api_transactions'), {'search': 'kino'})), [])
+        self.assertEqual(self.ids(self.api.get(reverse('api_transactions'), {'search': 'teat'})), [t.id])
+        Account.objects.filter(pk=self.cash.pk).update(name='Hamyon')
+        self.assertEqual(self.ids(self.api.get(reverse('api_transactions'), {'search': 'hamy'})), [t.id])
+        t.delete()
+        self.assertEqual(self.ids(self.api.get(reverse('api_transactions'), {'search': 'teat'})), [])
+
+    def test_ranked_search_prefers_category_hits(self):
+        by_account = Transaction.objects.create(account=self.card, amount=Decimal('1'), type='EXPENSE', category='Kitob')
+        by_category = Transaction.objects.create(account=self.cash, amount=Decimal('1'), type='EXPENSE', category='Card fee')
+        response = self.api.get(reverse('api_transactions_search'), {'q': 'card'})
+        self.assertEqual([row['id'] for row in response.json()], [by_category.id, by_account.id])
+        self.assertEqual(search.rebuild(), 2)
+
+
+
+@skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN faqat SQLite uchun")
+class QueryPlanTests(LedgerTestCase):
+    full_scan = re.compile(r'\bSCAN (configapp_\w+)\b(?! VIRTUAL TABLE)')
+    # Valyutalar va kurslar tarixi rates keshiga butunlay yuklanadi.
+    whole_table_loads = {'configapp_currency', 'configapp_currencyrate'}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        now = timezone.now()
+        Budget.objects.create(user=cls.user, name='MONTHLY', category='Food', amount_limit=Decimal('100'),
+                              currency=cls.uzs, month=now.month, year=now.year)
+        RecurringTransaction.objects.create(account=cls.cash, amount=Decimal('1'), type='EXPENSE', category='Gym',
+                                            frequency='WEEKLY', next_date=now.date())
+        ResetCode.objects.create(user=cls.user, code='123456')
+        Transaction.objects.create(account=cls.cash, amount=Decimal('1'), type='EXPENSE', category='Food')
+
+    def assertNoFullScans(self, action):
+        with CaptureQueriesContext(connection) as ctx:
+            action()
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT') and 'configapp_' in q['sql']]
+        self.assertTrue(selects)
+        for sql in selects:
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                plan = '\n'.join(row[-1] for row in cursor.fetchall())
+            scanned = set(self.full_scan.findall(plan)) - self.whole_table_loads
+            self.assertFalse(scanned, f"{sql}\n{plan}")
+
+    def test_dashboard(self):
+        self.assertNoFullScans(lambda: self.client.get(reverse('home')))
+
+    def test_budget_list(self):
+        self.assertNoFullScans(lambda: self.client.get(reverse('budget_list')))
+
+    def test_history(self):
+        self.assertNoFullScans(lambda: self.client.get(reverse('history'), {'type': 'EXPENSE'}))
+
+    def test_history_search(self):
+        self.assertNoFullScans(lambda: self.client.get(reverse('history'), {'search': 'foo'}))
+
+    def test_add_transaction(self):
+        self.assertNoFullScans(lambda: self.client.post(reverse('add_transaction'), {
+            'account': self.cash.id, 'amount': '1', 'type': 'EXPENSE', 'category': 'Food',
+        }))
+
+    def test_recurring_scheduler(self):
+        self.assertNoFullScans(recurring.post_due)
+
+    def test_reset_code_lookup(self):
+        self.assertNoFullScans(lambda: self.client.post(reverse('verify_code', args=[self.user.id]), {
+            'code': '123456', 'password': 'new-secret',
+        }))
+
+    def test_api_lists(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for name in ('api_accounts', 'api_transactions', 'api_goals'):
+            self.assertNoFullScans(lambda: client.get(reverse(name)))
+
+
+class AdminDashboardTests(LedgerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser(email='admin@example.com', password='secret', username='admin')
+        self.client.force_login(self.admin)
+        stats.refresh()
+
+    def test_counters_are_maintained_without_counting(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Transaction.objects.create(account=self.cash, amount=Decimal('1'), type='EXPENSE', category='Food')
+            User.objects.create_user(email='other@example.com', password='secret', username='other')
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('admin_panel'))
+        self.assertEqual((response.context['total_users'], response.context['total_transactions']), (2, 1))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('delete_user', args=[self.user.id]))
+        self.assertEqual(stats.snapshot(), {'total_users': 1, 'total_accounts': 0, 'total_transactions': 0})
+        self.assertEqual(stats.snapshot(), stats.refresh())
+
+    def test_user_list_is_paged(self):
+        User.objects.bulk_create(
+            User(email=f'user{i}@example.com', username=f'user{i}') for i in range(ADMIN_USERS_PAGE_SIZE + 5)
+        )
+        response = self.client.get(reverse('admin_panel'))
+        first = response.context['users_list']
+        self.assertEqual(len(first), ADMIN_USERS_PAGE_SIZE)
+        rest = self.client.get(reverse('admin_users'), {'after': response.context['next_after']}).context['users_list']
+        self.assertEqual(len(rest), 6)
+        self.assertEqual([u.account_count for u in rest if u.pk == self.user.pk], [2])
+
+    def test_model_list_is_paged_projected_and_filtered(self):
+        Transaction.objects.bulk_create(
+            Transaction(account=self.card if i % 2 else self.cash, amount=Decimal(i + 1), type='EXPENSE', category='Food')
+            for i in range(admin_lists.PAGE_SIZE + 10)
+        )
+        stats.refresh()
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('admin_manage_model', args=['transactions']), {'page': 2})
+        self.assertEqual((len(response.context['data']), response.context['total']), (10, admin_lists.PAGE_SIZE + 10))
+        self.assertContains(response, 'user@example.com')
+
+        response = self.client.get(reverse('admin_manage_model', args=['transactions']), {'currency': 'USD', 'sort': '-amount'})
+        amounts = [t.amount for t in response.context['data']]
+        self.assertEqual(response.context['total'], 30)
+        self.assertEqual(amounts, sorted(amounts, reverse=True))
+        self.assertEqual(self.client.get(reverse('admin_manage_model', args=['accounts']), {'sort': 'bogus'}).context['sort'], '-pk')
+
+
+class BulkImportTests(LedgerTestCase):
+    def test_api_upload_imports_valid_rows_in_chunks(self):
+        content = (
+            "account,amount,type,category,date\n"
+            "Cash,100.50,expense,Food,2026-01-15\n"
+            f"{self.card.id},3,INCOME,Salary,2026-01-16T10:00:00\n"
+            "Cash,abc,EXPENSE,Food,2026-01-17\n"
+            "Unknown,1,EXPENSE,Food,\n"
+            "cash,0.50,EXPENSE,food,2026-01-18\n"
+        )
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(reverse('api_transactions_import'), {
+            'file': SimpleUploadedFile('statement.csv', content.encode()),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['imported'], response.data['failed']), (3, 2))
+        self.assertEqual([e['row'] for e in response.data['errors']], [3, 4])
+        self.cash.refresh_from_db()
+        self.card.refresh_from_db()
+        self.assertEqual(self.cash.balance, Decimal('99899.00'))
+        self.assertEqual(self.card.balance, Decimal('13'))
+        self.assertEqual(MonthlyCategorySpend.objects.get(year=2026, month=1).amount, Decimal('101.00'))
+
+    def test_json_lines_stream_is_chunked(self):
+        lines = ''.join('{"account": "Cash", "amount": "1", "type": "EXPENSE", "category": "Food"}\n' for _ in range(25))
+        stream = SimpleUploadedFile('statement.jsonl', lines.encode()).file
+        report = importers.import_transactions(self.user, stream, 'jsonl', chunk_size=10)
+        self.assertEqual(report['imported'], 25)
+        self.assertEqual(Transaction.objects.filter(account=self.cash).count(), 25)
+
+    def test_json_array_file_and_non_string_dates(self):
+        rows = [
+            {'account': 'Cash', 'amount': '1', 'type': 'EXPENSE', 'category': 'Food', 'date': '2026-01-15'},
+            {'account': 'Cash', 'amount': '2', 'type': 'EXPENSE', 'category': 'Food', 'date': 1700000000},
+            {'account': 'Cash', 'amount': '3', 'type': 'EXPENSE', 'category': 'Food', 'date': ['2026-01-16']},
+            {'account': 'Cash', 'amount': '4', 'type': 'INCOME', 'category': 'Gift'},
+        ]
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with patch.object(importers, 'JSON_READ_SIZE', 16):
+            response = client.post(reverse('api_transactions_import'), {
+                'file': SimpleUploadedFile('statement.json', json.dumps(rows, indent=2).encode()),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['imported'], response.data['failed']), (2, 2))
+        self.assertEqual([e['row'] for e in response.data['errors']], [2, 3])
+        self.assertEqual(sorted(Transaction.objects.values_list('amount', flat=True)), [Decimal('1'), Decimal('4')])
+
+    def test_non_finite_and_oversized_amounts_fail_per_row(self):
+        content = "account,amount,type,category\n" + ''.join(
+            f"Cash,{amount},EXPENSE,Food\n" for amount in ('NaN', 'sNaN', 'Infinity', '-inf', '1' + '0' * 18, '1e30')
+        )
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(reverse('api_transactions_import'), {
+            'file': SimpleUploadedFile('statement.csv', content.encode()),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual((response.data['imported'], response.data['failed']), (0, 6))
+        self.assertFalse(Transaction.objects.exists())
+
+
+class ApiListTests(LedgerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+        for i in range(5):
+            Transaction.objects.create(account=self.card if i % 2 else self.cash, amount=Decimal('1.5'), type='EXPENSE', category='Food')
+            FinancialGoal.objects.create(user=self.user, title=f'Goal {i}', target_amount=Decimal('100'),
+                                         current_amount=Decimal(i * 30), currency=self.usd)
+
+    def test_fast_list_matches_model_serializer_without_extra_queries(self):
+        cases = [
+            ('api_accounts', AccountSerializer, Account.objects.filter(user=self.user)),
+            ('api_transactions', TransactionSerializer, Transaction.objects.filter(account__user=self.user).order_by('-date', '-id')),
+            ('api_goals', GoalSerializer, FinancialGoal.objects.filter(user=self.user)),
+        ]
+        for name, serializer_class, queryset in cases:
+            with self.subTest(name), self.assertNumQueries(2):
+                response = self.api.get(reverse(name))
+            body = response.json()
+            rows = body['results'] if isinstance(body, dict) else body
+            self.assertEqual(rows, json.loads(json.dumps(serializer_class(queryset, many=True).data)))
+
+
+class CachedTokenAuthTests(LedgerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.token = Token.objects.create(user=self.user)
+        self.api = APIClient()
+        self.api.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def assertStatus(self, status_code):
+        self.assertEqual(self.api.get(reverse('api_accounts')).status_code, status_code)
+
+    def test_repeat_requests_skip_token_lookup(self):
+        self.assertStatus(200)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertStatus(200)
+        self.assertFalse([q for q in ctx.captured_queries if 'authtoken_token' in q['sql']])
+
+    def test_password_change_and_deactivation_apply_immediately(self):
+        self.assertStatus(200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertStatus(401)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = True
+            self.user.save()
+        self.assertStatus(200)
+
+    def test_process_local_cache_is_not_used(self):
+        with patch.object(caching, 'shared', process_local_shared), self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                                   'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'shared'}}):
+            self.assertStatus(200)
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertStatus(200)
+            self.assertTrue([q for q in ctx.captured_queries if 'authtoken_token' in q['sql']])
+
+    def test_token_and_user_deletion_apply_immediately(self):
+        self.assertStatus(200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+        self.assertStatus(401)
+        self.token = Token.objects.create(user=self.user)
+        self.api.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.assertStatus(200)
+        admin = User.objects.create_superuser(email='admin@example.com', password='secret', username='admin')
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('delete_user', args=[self.user.id]))
+        self.assertStatus(401)
+
+
+class AuthThrottleTests(LedgerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.logout()
+        self.capacity = throttle_rates()['account'][0]
+
+    def test_login_rejected_before_password_check(self):
+        for _ in range(self.capacity):
+            self.client.post(reverse('login'), {'email': self.user.email, 'password': 'wrong'})
+        with patch('configapp.views.authenticate') as authenticate:
+            response = self.client.post(reverse('login'), {'email': self.user.email, 'password': 'secret'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        authenticate.assert_not_called()
+        self.assertEqual(self.client.post(reverse('login'), {'email': 'other@example.com', 'password': 'x'}).status_code, 200)
+
+    def test_ip_bucket_spans_emails(self):
+        for i in range(throttle_rates()['ip'][0]):
+            self.client.post(reverse('forgot_password'), {'email': f'nobody{i}@example.com'})
+        response = self.client.post(reverse('forgot_password'), {'email': self.user.email})
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_token_endpoint_shares_login_bucket(self):
+        api = APIClient()
+        for _ in range(self.capacity):
+            self.client.post(reverse('login'), {'email': self.user.email, 'password': 'wrong'})
+        response = api.post(reverse('api_token_auth'), {'email': self.user.email, 'password': 'secret'}, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+
+    def test_buckets_survive_many_distinct_clients(self):
+        factory = RequestFactory()
+        for _ in range(self.capacity):
+            throttling.attempt(factory.post('/'), 'login', self.user.email)
+        ips = [f'10.0.{i // 256}.{i % 256}' for i in range(400)]
+        for ip in ips:
+            throttling.attempt(factory.post('/', REMOTE_ADDR=ip), 'reset')
+        store = caches['throttle']
+        self.assertTrue(all(store.get(throttling._key('reset', 'ip', ip)) for ip in ips))
+        self.assertTrue(throttling.attempt(factory.post('/', REMOTE_ADDR='10.9.9.9'), 'login', self.user.email))
+
+
+class OutboxTests(LedgerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.logout()
+
+    def test_forgot_password_only_enqueues(self):
+        response = self.client.post(reverse('forgot_password'), {'email': self.user.email})
+        self.assertRedirects(response, reverse('verify_code', args=[self.user.id]))
+        self.assertEqual(len(mail.outbox), 0)
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.to, [self.user.email])
+        self.assertEqual(outbox.deliver(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(ResetCode.objects.get().code, mail.outbox[0].body)
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_batch_shares_one_connection(self):
+        for i in range(3):
+            outbox.enqueue('Subject', 'Body', [f'user{i}@example.com'])
+        with patch('configapp.outbox.get_connection', wraps=outbox.get_connection) as get_connection:
+            self.assertEqual(outbox.deliver(batch_size=2), 2)
+        get_connection.assert_called_once()
+        self.assertEqual(outbox.deliver(), 1)
+
+    def test_failures_back_off_then_give_up(self):
+        email = outbox.enqueue('Subject', 'Body', [self.user.email])
+        now = timezone.now()
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            self.assertEqual(outbox.deliver(now=now), 0)
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), ('PENDING', 1))
+            self.assertEqual(email.next_attempt_at, now + timedelta(seconds=outbox.BACKOFF))
+            self.assertEqual(outbox.deliver(now=now), 0)
+            for _ in range(outbox.MAX_ATTEMPTS - 1):
+                now = OutboxEmail.objects.get().next_attempt_at
+                outbox.deliver(now=now)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('FAILED', outbox.MAX_ATTEMPTS))
+        self.assertIn('down', email.last_error)
+        self.assertEqual(outbox.deliver(now=now + timedelta(days=1)), 0)
+
+    def test_reset_emails_are_dropped_once_the_code_expires(self):
+        self.client.post(reverse('forgot_password'), {'email': self.user.email})
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.expires_at, ResetCode.objects.get().created_at + timedelta(seconds=ResetCode.TTL))
+        now = email.created_at
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            outbox.deliver(now=now)
+            outbox.deliver(now=now + timedelta(seconds=outbox.BACKOFF))
+        email.refresh_from_db()
+        # Uchinchi urinish (30 + 60 soniyadan keyin) hali muddat ichida, to'rtinchisi esa yo'q.
+        self.assertEqual((email.status, email.attempts), ('PENDING', 2))
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            outbox.deliver(now=email.next_attempt_at)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('FAILED', 3))
+
+        outbox.enqueue('Subject', 'Body', [self.user.email], expires_at=now + timedelta(seconds=ResetCode.TTL))
+        self.assertEqual(outbox.deliver(now=now + timedelta(seconds=ResetCode.TTL)), 0)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.filter(last_error='Expired').count(), 1)
+
+
+class ResetCodeTests(LedgerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.logout()
+
+    def verify(self, code, password='new-secret'):
+        return self.client.post(reverse('verify_code', args=[self.user.id]), {'code': code, 'password': password})
+
+    def test_issue_replaces_code_and_purges_expired(self):
+        other = User.objects.create_user(email='other@example.com', password='x', username='other')
+        ResetCode.objects.create(user=other, code='111111', created_at=timezone.now() - timedelta(seconds=ResetCode.TTL))
+        ResetCode.objects.issue(self.user, '222222')
+        ResetCode.objects.issue(self.user, '333333')
+        self.assertEqual(list(ResetCode.objects.values_list('user', 'code')), [(self.user.id, '333333')])
+
+    def test_code_locks_after_too_many_attempts(self):
+        ResetCode.objects.issue(self.user, '123456')
+        for _ in range(ResetCode.MAX_ATTEMPTS):
+            self.verify('000000')
+        caches['throttle'].clear()
+        self.assertEqual(self.verify('123456').status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('secret'))
+
+    def test_successful_reset_consumes_code(self):
+        ResetCode.objects.issue(self.user, '123456')
+        self.assertRedirects(self.verify('123456'), reverse('login'))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('new-secret'))
+        self.assertFalse(ResetCode.objects.exists())
+
+
+class BenchmarkTests(LedgerTestCase):
+    def test_generator_builds_consistent_ledger(self):
+        MonthlyCategorySpend.objects.create(user=self.user, year=2020, month=1, category=Category.objects.resolve('Food'),
+                                            currency=self.uzs, amount=Decimal('5'))
+        users = synthetic.generate(users=2, accounts=2, transactions=200, batch_size=64)['users']
+        # Mavjud foydalanuvchilarning jadvaliga tegilmaydi.
+        self.assertEqual(MonthlyCategorySpend.objects.get(user=self.user).amount, Decimal('5'))
+        accounts = Account.objects.filter(user__in=users)
+        self.assertEqual(Transaction.objects.filter(account__in=accounts).count(), 200)
+        self.assertFalse(accounts.filter(balance__lt=0).exists())
+        self.assertEqual(DataVersion.objects.filter(user__in=users).count(), 2)
+        expenses = Transaction.objects.filter(account__in=accounts, type='EXPENSE').aggregate(total=Sum('amount'))['total']
+        self.assertEqual(MonthlyCategorySpend.objects.filter(user__in=users).aggregate(total=Sum('amount'))['total'], expenses)
+
+    def test_bench_views_reports_every_endpoint(self):
+        caching.shared_or_default().set('real-user-entry', 1)
+        out = io.StringIO()
+        call_command('bench_views', '--sizes', '40', '--users', '2', '--repeat', '2', stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(caching.shared_or_default().get('real-user-entry'), 1)
+        queries = {row['endpoint']: row['queries'] for row in report['results']}
+        self.assertGreater(queries['home_view']['min'], queries['home_view_cached']['max'])
+        self.assertEqual({row['endpoint'] for row in report['results']}, {
+            'home_view', 'home_view_cached', 'budget_list', 'history_view', 'add_transaction', 'api_accounts', 'api_transactions', 'api_goals',
+        })
+        self.assertTrue(all(row['status'] in (200, 302) for row in report['results']))
+        self.assertFalse(User.objects.filter(email__startswith='synthetic-').exists())
+
+
+class ExportTests(LedgerTestCase):
+    def test_streams_filtered_history(self):
+        Transaction.objects.create(account=self.cash, amount=Decimal('10'), type='EXPENSE', category='Food')
+        Transaction.objects.create(account=self.card, amount=Decimal('2.50'), type='EXPENSE', category='Fast food')
+        Transaction.objects.create(account=self.card, amount=Decimal('7'), type='INCOME', category='Food refund')
+        response = self.client.get(reverse('export_transactions'), {'type': 'EXPENSE', 'search': 'food'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(lines[0], 'id,date,account,currency,type,category,amount')
+        self.assertEqual([line.split(',')[2:] for line in lines[1:]], [
+            ['Card', 'USD', 'EXPENSE', 'Fast food', '2.50'],
+            ['Cash', 'UZS', 'EXPENSE', 'Food', '10.00'],
+        ])
+
+    def test_ndjson(self):
+        Transaction.objects.create(account=self.cash, amount=Decimal('10'), type='EXPENSE', category='Food')
+        response = self.client.get(reverse('export_transactions'), {'format': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(rows[0]['category'], 'Food')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+    async def test_asgi_export_streams_before_queryset_is_exhausted(self):
+        await Transaction.objects.abulk_create(
+            Transaction(account=self.cash, amount=Decimal('1'), type='EXPENSE', category='Food') for _ in range(10)
+        )
+        await self.async_client.aforce_login(self.user)
+        built = []
+        row = exporters._row
+        with patch.object(exporters, 'ITERATOR_CHUNK_SIZE', 2), \
+                patch.object(exporters, '_row', side_effect=lambda t: built.append(t.id) or row(t)):
+            response = await self.async_client.get(reverse('export_transactions'))
+            chunks = response.__aiter__()
+            header = await anext(chunks)
+            self.assertEqual(header.decode('utf-8-sig').strip(), ','.join(exporters.FIELDS))
+            await anext(chunks)
+            self.assertLess(len(built), 10)
+            rest = [chunk async for chunk in chunks]
+        self.assertEqual(len(rest), 9)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class BalanceConcurrencyTests(TransactionTestCase):
+    threads = 8
+
+    def setUp(self):
+        currency = Currency.objects.create(code='UZS', rate=Decimal('1'))
+        user = User.objects.create_user(email='user@example.com', password='secret', username='user')
+        self.accounts = [
+            Account.objects.create(user=user, name=f'Account {i}', type='CASH', balance=Decimal('0'), currency=currency)
+            for i in range(4)
+        ]
+
+    def hammer(self, withdraw, operations):
+        successes = []
+
+        def worker(offset):
+            try:
+                for i in range(operations):
+                    account = self.accounts[(offset + i) % len(self.accounts)]
+                    if withdraw(account.id, Decimal('1')):
+                        successes.append(account.id)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=worker, args=(k,)) for k in range(self.threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        return successes
+
+    def test_unknown_type_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ledger.apply(self.accounts[0].id, Decimal('1'), 'GIFT')
+        self.assertEqual(Account.objects.get(pk=self.accounts[0].id).balance, Decimal('0'))
+
+    def test_withdrawals_never_overdraw_or_lose_updates(self):
+        Account.objects.update(balance=Decimal('100'))
+        successes = self.hammer(ledger.withdraw, 100)
+        self.assertEqual(len(successes), 400)
+        self.assertEqual(set(Account.objects.values_list('balance', flat=True)), {Decimal('0')})
+
+    def test_conditional_update_matches_global_lock(self):
+        global_lock = threading.Lock()
+
+        def locked_withdraw(account_id, amount):
+            with global_lock, transaction.atomic():
+                account = Account.objects.get(pk=account_id)
+                if account.balance < amount:
+                    return False
+                account.balance -= amount
+                account.save()
+                return True
+
+        # SQLite yozuvlarni baribir ketma-ket bajaradi, shuning uchun vaqt emas, faqat natija solishtiriladi.
+        Account.objects.update(balance=Decimal('1000'))
+        locked = self.hammer(locked_withdraw, 200)
+        self.assertEqual(set(Account.objects.values_list('balance', flat=True)), {Decimal('600')})
+        Account.objects.update(balance=Decimal('1000'))
+        conditional = self.hammer(ledger.withdraw, 200)
+        self.assertEqual(len(conditional), len(locked))
+        self.assertEqual(set(Account.objects.values_list('balance', flat=True)), {Decimal('600')})
@@ -0,0 +1,84 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.shortcuts import render
+from django.utils.translation import gettext as _
+from rest_framework.throttling import BaseThrottle
+
+PREFIX = 'auth_throttle:'
+
+# (sig'im, to'liq to'lish vaqti soniyada): IP bo'yicha qisqa portlashga ruxsat,
+# bitta email/hisob bo'yicha esa daqiqasiga taxminan bitta urinish.
+DEFAULT_RATES = {
+    'ip': (20, 60),
+    'account': (5, 300),
+}
+
+
+def rates():
+    return {**DEFAULT_RATES, **getattr(settings, 'AUTH_THROTTLE_RATES', {})}
+
+
+def _store():
+    # Barcha worker'lar bir xil hisobni ko'rishi uchun alohida umumiy kesh.
+    return caches['throttle'] if 'throttle' in settings.CACHES else caches['default']
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR') or 'unknown'
+
+
+def _key(action, kind, ident):
+    return f'{PREFIX}{action}:{kind}:' + hashlib.sha1(ident.encode()).hexdigest()
+
+
+def _take(store, key, capacity, period, now):
+    tokens, stamp = store.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - stamp) * capacity / period)
+    if tokens < 1:
+        return (1 - tokens) * period / capacity
+    store.set(key, (tokens - 1, now), period)
+    return 0
+
+
+def attempt(request, action, account=None):
+    # 0 - ruxsat; aks holda qayta urinishgacha kutish kerak bo'lgan soniyalar.
+    # get/set atomar emas: parallel so'rovlar chegaradan bir-ikki urinish oshishi mumkin.
+    buckets = [('ip', client_ip(request))]
+    if account:
+        buckets.append(('account', str(account).strip().casefold()))
+    store, limits, now = _store(), rates(), time.time()
+    return max(_take(store, _key(action, kind, ident), *limits[kind], now) for kind, ident in buckets)
+
+
+def throttle(action, template, account=None):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method == 'POST':
+                wait = attempt(request, action, account(request, **kwargs) if account else None)
+                if wait:
+                    seconds = int(wait) + 1
+                    messages.error(request, _("Juda ko'p urinish. %(seconds)s soniyadan keyin qayta urinib ko'ring.") % {'seconds': seconds})
+                    response = render(request, template, status=429)
+                    response['Retry-After'] = str(seconds)
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class AuthAttemptThrottle(BaseThrottle):
+    action = 'login'
+
+    def allow_request(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        self.delay = attempt(request, self.action, email)
+        return not self.delay
+
+    def wait(self):
+        return self.delay
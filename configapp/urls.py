@@ -4,7 +4,9 @@ from . import views
 
 urlpatterns = [
     path('', views.home_view, name='home'),
+    path('dashboard/data/', views.dashboard_data, name='dashboard_data'),
     path('history/', views.history_view, name='history'),
+    path('history/export/', views.export_transactions, name='export_transactions'),
     path('goals-history/', views.goals_history, name='goals_history'),
     path('add-transaction/', views.add_transaction, name='add_transaction'),
     path('add-account/', views.add_account, name='add_account'),
@@ -21,11 +23,14 @@ urlpatterns = [
     path('change-password/', views.change_password, name='change_password'),
 
     path('admin-panel/', views.admin_dashboard, name='admin_panel'),
+    path('admin-panel/users/', views.admin_users, name='admin_users'),
     path('admin-manage/<str:model_name>/', views.admin_manage_model, name='admin_manage_model'),
     path('admin-delete-user/<int:user_id>/', views.delete_user, name='delete_user'),
 
     path('api/accounts/', views.AccountViewSet.as_view({'get': 'list', 'post': 'create'}), name='api_accounts'),
     path('api/transactions/', views.TransactionViewSet.as_view({'get': 'list', 'post': 'create'}), name='api_transactions'),
+    path('api/transactions/import/', views.TransactionViewSet.as_view({'post': 'bulk_import'}), name='api_transactions_import'),
+    path('api/transactions/search/', views.TransactionViewSet.as_view({'get': 'search'}), name='api_transactions_search'),
     path('api/goals/', views.GoalViewSet.as_view({'get': 'list', 'post': 'create'}), name='api_goals'),
     path('api-token-auth/', views.CustomObtainAuthToken.as_view(), name='api_token_auth'),
 
@@ -0,0 +1,59 @@
+import hashlib
+
+from django.db.models import F
+from django.utils import timezone, translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from . import rates
+from .models import DataVersion
+
+
+# Foydalanuvchi ma'lumotlari o'zgarganda versiya oshiriladi; ETag shu versiyadan
+# olinadi. touch_owner() egasini bitta PK subquery orqali topadi, masalan
+# touch_owner(Account, pk=account_id).
+def touch(user_id):
+    _bump(DataVersion.objects.filter(user_id=user_id))
+
+
+def touch_owner(model, **lookup):
+    _bump(DataVersion.objects.filter(user_id__in=model.objects.filter(**lookup).values('user_id')))
+
+
+def _bump(rows):
+    rows.update(version=F('version') + 1, updated_at=timezone.now())
+
+
+def current(user):
+    return DataVersion.objects.get_or_create(user_id=user.pk)[0]
+
+
+async def acurrent(user):
+    return (await DataVersion.objects.aget_or_create(user_id=user.pk))[0]
+
+
+def etag(stamp, *parts):
+    raw = '|'.join(str(part) for part in (stamp.version, rates.version(), translation.get_language(), *parts))
+    return f'"{stamp.user_id}-{hashlib.sha1(raw.encode()).hexdigest()[:16]}"'
+
+
+def not_modified(request, stamp, tag):
+    # Last-Modified faqat ma'lumot uchun: soniyagacha yaxlitlangani sababli bir soniya
+    # ichidagi ikki yozuvni ajrata olmaydi, shuning uchun 304 faqat ETag mos kelsa qaytadi.
+    response = get_conditional_response(request, etag=tag)
+    return finalize(response, stamp, tag) if response is not None else None
+
+
+def finalize(response, stamp, tag):
+    response['ETag'] = tag
+    response['Last-Modified'] = http_date(stamp.updated_at.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class ConditionalListMixin:
+    def list(self, request, *args, **kwargs):
+        stamp = current(request.user)
+        # Filtrlar, qidiruv va kursor ham tegga kiradi: har bir sahifaning o'z ETag'i bor.
+        tag = etag(stamp, request.accepted_renderer.format, request.get_full_path())
+        return not_modified(request, stamp, tag) or finalize(super().list(request, *args, **kwargs), stamp, tag)
@@ -1,97 +1,135 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Sum
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.middleware.csrf import get_token
+from django.db import transaction
+from django.db.models import Count, F
 from django.utils import timezone
 from django.contrib.auth import login, authenticate, logout, get_user_model, update_session_auth_hash
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.core.mail import send_mail
-from django.conf import settings
 from django.contrib.auth.forms import PasswordChangeForm
 from django.utils.translation import gettext as _
+from datetime import timedelta
 from decimal import Decimal
-import random
+import asyncio
+import secrets
+
+from asgiref.sync import sync_to_async
 
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.authtoken.views import ObtainAuthToken
-from rest_framework.parsers import JSONParser
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.parsers import JSONParser, MultiPartParser
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
-from .models import Account, Transaction, FinancialGoal, Currency, ResetCode, RecurringTransaction, Budget
+from . import admin_lists, caching, dashboard, exporters, importers, ledger, money, outbox, rates, rollups, stats, versions
+from . import search as search_index
+from .authentication import CachedTokenAuthentication
+from .models import Account, Transaction, FinancialGoal, Currency, ResetCode, Budget, Category
+from .listing import FastListMixin
+from .pagination import ADMIN_USERS_PAGE_SIZE, TransactionCursorPagination, akeyset_page
 from .serializers import AccountSerializer, TransactionSerializer, GoalSerializer, EmailAuthTokenSerializer
+from .throttling import AuthAttemptThrottle, throttle
+from .versions import ConditionalListMixin
 
 User = get_user_model()
 
 def is_admin(user):
     return user.is_superuser
 
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+def _csrf_secret(request):
+    # get_token() har safar boshqa niqoblangan qiymat qaytaradi; ETag uchun sirning o'zi kerak.
+    get_token(request)
+    return request.META['CSRF_COOKIE']
+
+async def _dashboard_payload(user, target_currency, current_time):
+    budgets = await _alist(Budget.objects.filter(user=user, month=current_time.month, year=current_time.year).select_related('currency'))
+    accounts, goals, balance_rows, category_rows, budget_rows = await asyncio.gather(
+        _alist(Account.objects.filter(user=user).select_related('currency')),
+        _alist(FinancialGoal.objects.filter(user=user)),
+        _alist(dashboard.balance_rows(user)),
+        _alist(dashboard.category_rows(user)),
+        _alist(rollups.budget_rows(user, budgets)),
+    )
+    category_totals, total, budget_progress = await sync_to_async(_dashboard_totals)(category_rows, balance_rows, budgets, budget_rows, target_currency)
+    chart_labels = list(category_totals.keys())
+    chart_data = [float(v) for v in category_totals.values()]
+    return {
+        'accounts': accounts,
+        'goals': goals,
+        'total': total,
+        'chart_labels': chart_labels,
+        'chart_data': chart_data,
+        'chart': await sync_to_async(render_to_string)('home_chart.html', {'chart_labels': chart_labels, 'chart_data': chart_data}),
+        'budgets': budget_progress,
+    }
+
+# Konvertatsiya kurslar versiyasini umumiy keshdan (fayl) o'qiydi: event loop'ni to'xtatmasligi uchun thread'da.
+def _dashboard_totals(category_rows, balance_rows, budgets, budget_rows, target_currency):
+    return (
+        dashboard.category_totals(category_rows, target_currency),
+        dashboard.total_balance(balance_rows, target_currency),
+        dashboard.budget_progress(budgets, rollups.spent_by_budget(budgets, budget_rows)),
+    )
+
+async def _cached_payload(user, cursor, target_currency, current_time):
+    # Umumiy keshda: har bir yozuvdan keyin payload barcha worker'lar uchun bir marta hisoblanadi.
+    store = caching.shared_or_default()
+    key = dashboard.cache_key(user.pk, cursor)
+    payload = await store.aget(key)
+    if payload is None:
+        payload = await _dashboard_payload(user, target_currency, current_time)
+        await store.aset_many({key: payload, dashboard.snapshot_key(user.pk, cursor): dashboard.snapshot(payload)}, dashboard.cache_ttl())
+    return payload
+
 @login_required(login_url='login')
-def home_view(request):
-    if request.user.is_superuser:
+async def home_view(request):
+    user = await request.auser()
+    if user.is_superuser:
         return redirect('admin_panel')
-    today = timezone.now().date()
     current_time = timezone.now()
-    recurring = RecurringTransaction.objects.filter(next_date__lte=today, account__user=request.user)
-    for item in recurring:
-        if item.type == 'EXPENSE' and item.account.balance < item.amount:
-            continue
-        Transaction.objects.create(
-            account=item.account,
-            amount=item.amount,
-            type=item.type,
-            category=_("Auto: %(category)s") % {'category': item.category}
-        )
-        if item.type == 'INCOME':
-            item.account.balance += item.amount
-        else:
-            item.account.balance -= item.amount
-        item.account.save()
-        days = 30 if item.frequency == 'MONTHLY' else 7
-        item.next_date += timezone.timedelta(days=days)
-        item.save()
-    selected_code = request.GET.get('currency', 'UZS')
-    target_currency = Currency.objects.filter(code=selected_code).first() or \
-                      Currency.objects.filter(code='UZS').first() or \
-                      Currency.objects.first()
-    accounts = Account.objects.filter(user=request.user)
-    goals = FinancialGoal.objects.filter(user=request.user)
-    budgets = Budget.objects.filter(user=request.user, month=current_time.month, year=current_time.year)
-    budget_data = []
-    for b in budgets:
-        spent = Transaction.objects.filter(
-            account__user=request.user,
-            category=b.category,
-            type='EXPENSE',
-            date__month=current_time.month,
-            date__year=current_time.year
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        budget_data.append({
-            'info': b,
-            'spent': spent,
-            'percent': int((spent / b.amount_limit) * 100) if b.amount_limit > 0 else 0
-        })
-    total_balance = Decimal('0.00')
-    category_totals = {}
-    for acc in accounts:
-        acc_rate = acc.currency.rate
-        total_balance += (acc.balance * acc_rate / target_currency.rate)
-        acc_transactions = Transaction.objects.filter(account=acc, type='EXPENSE')
-        for t in acc_transactions:
-            converted_amount = t.amount * acc_rate / target_currency.rate
-            category_totals[t.category] = category_totals.get(t.category, Decimal('0')) + converted_amount
-    return render(request, 'home.html', {
-        'accounts': accounts,
-        'goals': goals,
-        'total': total_balance,
+    stamp = await versions.acurrent(user)
+    tag = await sync_to_async(versions.etag)(stamp, request.GET.get('currency', 'UZS'), current_time.strftime('%Y-%m'), _csrf_secret(request))
+    # Flash xabar bo'lsa sahifa har doim qayta chiziladi, aks holda xabar yo'qoladi.
+    if not await sync_to_async(len)(messages.get_messages(request)):
+        not_modified = versions.not_modified(request, stamp, tag)
+        if not_modified: return not_modified
+    target_currency = await rates.aresolve(request.GET.get('currency', 'UZS'))
+    cursor = await sync_to_async(dashboard.cursor)(stamp, target_currency, current_time.strftime('%Y-%m'))
+    response = await sync_to_async(render)(request, 'home.html', {
+        **await _cached_payload(user, cursor, target_currency, current_time),
         'selected_currency': target_currency,
-        'all_currencies': Currency.objects.all(),
-        'chart_labels': list(category_totals.keys()),
-        'chart_data': [float(v) for v in category_totals.values()],
-        'budgets': budget_data,
+        'all_currencies': await sync_to_async(rates.currencies)(),
+        'dashboard_cursor': cursor,
     })
+    return versions.finalize(response, stamp, tag)
+
+@login_required(login_url='login')
+async def dashboard_data(request):
+    user = await request.auser()
+    current_time = timezone.now()
+    stamp = await versions.acurrent(user)
+    target_currency = await rates.aresolve(request.GET.get('currency', 'UZS'))
+    cursor = await sync_to_async(dashboard.cursor)(stamp, target_currency, current_time.strftime('%Y-%m'))
+    since = request.GET.get('since', '')[:200]
+    if since == cursor:
+        return JsonResponse({'cursor': cursor, 'full': False})
+    store = caching.shared_or_default()
+    current = await store.aget(dashboard.snapshot_key(user.pk, cursor))
+    if current is None:
+        current = dashboard.snapshot(await _cached_payload(user, cursor, target_currency, current_time))
+    # Mijoz ko'rgan holat umumiy keshdan olinadi; u yo'q bo'lsa (TTL, boshqa valyuta) to'liq javob qaytadi.
+    previous = await store.aget(dashboard.snapshot_key(user.pk, since)) if since else None
+    if previous is None:
+        return JsonResponse({'cursor': cursor, 'full': True, **dashboard.delta({}, current)})
+    return JsonResponse({'cursor': cursor, 'full': False, **dashboard.delta(previous, current)})
 
 @login_required(login_url='login')
 def add_transaction(request):
@@ -100,27 +138,21 @@ def add_transaction(request):
         amount = Decimal(request.POST.get('amount', '0'))
         t_type = request.POST.get('type')
         category = request.POST.get('category').strip()
-        if t_type == 'EXPENSE':
-            if account.balance < amount:
+        if t_type not in ledger.TYPES:
+            messages.error(request, _("Tranzaksiya turi noto'g'ri."))
+            return redirect('home')
+        with transaction.atomic():
+            if not ledger.apply(account.id, amount, t_type):
                 messages.error(request, _("Mablag' yetarli emas!"))
                 return redirect('home')
+            ref = Category.objects.resolve(category)
+            t = Transaction.objects.create(account=account, amount=amount, type=t_type, category=category, category_ref=ref)
+            rollups.record([t])
+        if t_type == 'EXPENSE':
             today = timezone.now()
-            budget = Budget.objects.filter(user=request.user, category__iexact=category, month=today.month, year=today.year).first()
-            if budget:
-                transactions = Transaction.objects.filter(account__user=request.user, category__iexact=category, type='EXPENSE', date__month=today.month, date__year=today.year)
-                total_spent_in_budget_curr = Decimal('0.00')
-                for t in transactions:
-                    conv = (t.amount / t.account.currency.rate) * budget.currency.rate
-                    total_spent_in_budget_curr += conv
-                new_conv_amount = (amount / account.currency.rate) * budget.currency.rate
-                if (total_spent_in_budget_curr + new_conv_amount) > budget.amount_limit:
-                    messages.warning(request, _("%(category)s uchun byudjet limitidan oshdingiz!") % {'category': category})
-        if t_type == 'INCOME':
-            account.balance += amount
-        else:
-            account.balance -= amount
-        account.save()
-        Transaction.objects.create(account=account, amount=amount, type=t_type, category=category)
+            budget = Budget.objects.filter(user=request.user, category_ref=ref, month=today.month, year=today.year).first()
+            if budget and rollups.spent(request.user, ref.id, today.year, today.month, budget.currency_id) > budget.amount_limit:
+                messages.warning(request, _("%(category)s uchun byudjet limitidan oshdingiz!") % {'category': category})
         messages.success(request, _("Tranzaksiya saqlandi!"))
     return redirect('home')
 
@@ -151,22 +183,26 @@ def add_budget(request):
     return redirect('home')
 
 @login_required(login_url='login')
-def budget_list(request):
-    budgets = Budget.objects.filter(user=request.user)
-    budget_data = []
+async def budget_list(request):
+    user = await request.auser()
+    await rates.arefresh()
+    budgets = await _alist(Budget.objects.filter(user=user).select_related('currency'))
+    transaction_lists = []
     for budget in budgets:
-        related_transactions = Transaction.objects.filter(account__user=request.user, category__iexact=budget.category, type='EXPENSE', date__month=budget.month, date__year=budget.year).order_by('-date')
-        total_spent = Decimal('0.00')
-        for t in related_transactions:
-            converted_amount = (t.amount / t.account.currency.rate) * budget.currency.rate
-            total_spent += converted_amount
+        start, end = dashboard.month_bounds(budget.year, budget.month)
+        transaction_lists.append(_alist(Transaction.objects.filter(account__user=user, category_ref_id=budget.category_ref_id, type='EXPENSE', date__gte=start, date__lt=end).select_related('account__currency').order_by('-date')))
+    budget_rows, *transaction_lists = await asyncio.gather(_alist(rollups.budget_rows(user, budgets)), *transaction_lists)
+    spent_by_budget = await sync_to_async(rollups.spent_by_budget)(budgets, budget_rows)
+    budget_data = []
+    for budget, related_transactions in zip(budgets, transaction_lists):
+        total_spent = spent_by_budget[budget.id]
         budget_data.append({
             'info': budget,
             'transactions': related_transactions,
             'total_spent': round(total_spent, 2),
             'percent': int((total_spent / budget.amount_limit) * 100) if budget.amount_limit > 0 else 0
         })
-    return render(request, 'budgets.html', {'budget_data': budget_data})
+    return await sync_to_async(render)(request, 'budgets.html', {'budget_data': budget_data})
 
 @login_required(login_url='login')
 def add_goal(request):
@@ -182,18 +218,20 @@ def contribute_to_goal(request):
         goal = get_object_or_404(FinancialGoal, id=request.POST.get('goal'), user=request.user)
         account = get_object_or_404(Account, id=request.POST.get('account'), user=request.user)
         amount = Decimal(request.POST.get('amount', '0'))
-        if account.balance >= amount:
-            account.balance -= amount
-            account.save()
-            converted_amount = (amount * account.currency.rate) / goal.currency.rate
-            goal.current_amount += converted_amount
-            goal.save()
-            Transaction.objects.create(account=account, amount=amount, type='EXPENSE', category=_("Goal: %(title)s") % {'title': goal.title})
-            messages.success(request, _("Maqsadga %(amount)s %(code)s qo'shildi!") % {'amount': round(converted_amount, 2), 'code': goal.currency.code})
+        converted_amount = money.convert(amount, account.currency_id, goal.currency_id)
+        with transaction.atomic():
+            withdrawn = ledger.withdraw(account.id, amount)
+            if withdrawn:
+                ledger.add_to_goal(goal.id, converted_amount)
+                t = Transaction.objects.create(account=account, amount=amount, type='EXPENSE', category=_("Goal: %(title)s") % {'title': goal.title})
+                rollups.record([t])
+        if withdrawn:
+            messages.success(request, _("Maqsadga %(amount)s %(code)s qo'shildi!") % {'amount': round(converted_amount, 2), 'code': rates.by_id(goal.currency_id).code})
         else:
             messages.error(request, _("Mablag' yetarli emas!"))
     return redirect('home')
 
+@throttle('login', 'login.html', account=lambda request: request.POST.get('email'))
 def login_view(request):
     if request.user.is_authenticated:
         return redirect('admin_panel') if request.user.is_superuser else redirect('home')
@@ -205,6 +243,7 @@ def login_view(request):
         messages.error(request, _("Email yoki parol noto'g'ri!"))
     return render(request, 'login.html')
 
+@throttle('register', 'register.html')
 def register_view(request):
     if request.method == "POST":
         email = request.POST.get('email')
@@ -222,32 +261,37 @@ def logout_view(request):
     logout(request)
     return redirect('login')
 
+@throttle('reset', 'forgot_password.html', account=lambda request: request.POST.get('email'))
 def forgot_password(request):
     if request.method == "POST":
         email = request.POST.get('email')
         user = User.objects.filter(email=email).first()
         if user:
-            code = str(random.randint(100000, 999999))
-            ResetCode.objects.create(user=user, code=code)
-            try:
-                send_mail(_('FinanceHome - Tasdiqlash kodi'), _('Sizning tasdiqlash kodingiz: %(code)s') % {'code': code}, settings.EMAIL_HOST_USER, [email])
-                messages.success(request, _("Kod yuborildi!"))
-                return redirect('verify_code', user_id=user.id)
-            except Exception:
-                messages.error(request, _("Email yuborishda xatolik yuz berdi."))
+            code = f'{secrets.randbelow(1000000):06d}'
+            with transaction.atomic():
+                reset = ResetCode.objects.issue(user, code)
+                # Xat navbatga qo'yiladi; send_outbox ishchisi uni fonda yuboradi (kod eskirguncha).
+                outbox.enqueue(_('FinanceHome - Tasdiqlash kodi'), _('Sizning tasdiqlash kodingiz: %(code)s') % {'code': code}, [email],
+                               expires_at=reset.created_at + timedelta(seconds=ResetCode.TTL))
+            messages.success(request, _("Kod yuborildi!"))
+            return redirect('verify_code', user_id=user.id)
         else:
             messages.error(request, _("Foydalanuvchi topilmadi."))
     return render(request, 'forgot_password.html')
 
+@throttle('reset', 'verify_code.html', account=lambda request, user_id: f'user:{user_id}')
 def verify_code(request, user_id):
     if request.method == "POST":
-        reset = ResetCode.objects.filter(user_id=user_id, code=request.POST.get('code')).last()
-        if reset and reset.is_valid():
+        reset = ResetCode.objects.filter(user_id=user_id).select_related('user').first()
+        if reset and reset.is_valid() and reset.matches(request.POST.get('code')):
             reset.user.set_password(request.POST.get('password'))
             reset.user.save()
+            reset.delete()
             messages.success(request, _("Parol muvaffaqiyatli o'zgartirildi!"))
             return redirect('login')
         else:
+            if reset:
+                ResetCode.objects.filter(pk=reset.pk).update(attempts=F('attempts') + 1)
             messages.error(request, _("Kod noto'g'ri yoki muddati o'tgan."))
     return render(request, 'verify_code.html')
 
@@ -264,14 +308,36 @@ def change_password(request):
         form = PasswordChangeForm(request.user)
     return render(request, 'change_password.html', {'form': form})
 
-@login_required(login_url='login')
-def history_view(request):
-    transactions = Transaction.objects.filter(account__user=request.user).order_by('-date')
+def _history_queryset(request, user):
+    transactions = Transaction.objects.filter(account__user=user).select_related('account__currency')
     t_type = request.GET.get('type')
     search = request.GET.get('search')
     if t_type: transactions = transactions.filter(type=t_type)
-    if search: transactions = transactions.filter(category__icontains=search)
-    return render(request, 'history.html', {'transactions': transactions})
+    if search: transactions = search_index.filter_transactions(transactions, user, search)
+    return transactions
+
+@login_required(login_url='login')
+async def history_view(request):
+    user = await request.auser()
+    page, next_cursor = await akeyset_page(_history_queryset(request, user), request.GET.get('cursor'))
+    return await sync_to_async(render)(request, 'history.html', {'transactions': page, 'next_cursor': next_cursor})
+
+@login_required(login_url='login')
+def export_transactions(request):
+    fmt = 'ndjson' if request.GET.get('format') == 'ndjson' else 'csv'
+    queryset = _history_queryset(request, request.user).order_by('-date', '-id')
+    if isinstance(request, ASGIRequest):
+        rows = exporters.aexport_rows(queryset)
+        content = exporters.aas_ndjson(rows) if fmt == 'ndjson' else exporters.aas_csv(rows)
+    else:
+        rows = exporters.export_rows(queryset)
+        content = exporters.as_ndjson(rows) if fmt == 'ndjson' else exporters.as_csv(rows)
+    if fmt == 'ndjson':
+        response = StreamingHttpResponse(content, content_type='application/x-ndjson')
+    else:
+        response = StreamingHttpResponse(content, content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="transactions.{fmt}"'
+    return response
 
 @login_required(login_url='login')
 def goals_history(request):
@@ -281,72 +347,130 @@ def goals_history(request):
 @login_required(login_url='login')
 @user_passes_test(is_admin)
 def admin_dashboard(request):
-    return render(request, 'admin_custom.html', {
-        'total_users': User.objects.filter(is_superuser=False).count(),
-        'total_accounts': Account.objects.count(),
-        'total_transactions': Transaction.objects.count(),
-        'users_list': User.objects.filter(is_superuser=False).prefetch_related('account_set'),
-        'recent_transactions': Transaction.objects.all().order_by('-date')[:10],
-    })
+    users_list, next_after = _admin_users_page()
+    return render(request, 'admin_custom.html', {**stats.snapshot(), 'users_list': users_list, 'next_after': next_after})
+
+def _admin_users_page(after=None):
+    users = User.objects.filter(is_superuser=False).only('id', 'email', 'date_joined').order_by('-id')
+    if after: users = users.filter(id__lt=after)
+    page = list(users[:ADMIN_USERS_PAGE_SIZE + 1])
+    next_after = page[ADMIN_USERS_PAGE_SIZE - 1].id if len(page) > ADMIN_USERS_PAGE_SIZE else None
+    page = page[:ADMIN_USERS_PAGE_SIZE]
+    counts = dict(Account.objects.filter(user__in=page).values('user_id').annotate(n=Count('id')).values_list('user_id', 'n').order_by())
+    for u in page:
+        u.account_count = counts.get(u.id, 0)
+    return page, next_after
+
+@login_required(login_url='login')
+@user_passes_test(is_admin)
+def admin_users(request):
+    try:
+        after = int(request.GET.get('after', ''))
+    except ValueError:
+        after = None
+    users_list, next_after = _admin_users_page(after)
+    return render(request, 'admin_user_rows.html', {'users_list': users_list, 'next_after': next_after, 'fragment': True})
 
 @login_required(login_url='login')
 @user_passes_test(is_admin)
 def admin_manage_model(request, model_name):
-    maps = {
-        'accounts': (Account, [_('User'), _('Name'), _('Balance'), _('Currency')]),
-        'transactions': (Transaction, [_('Account'), _('Amount'), _('Type'), _('Category')]),
-        'currencies': (Currency, [_('Name'), _('Code'), _('Rate')]),
-        'goals': (FinancialGoal, [_('User'), _('Title'), _('Target'), _('Current')])
-    }
-    model_info = maps.get(model_name)
-    if not model_info: return redirect('admin_panel')
-    model, cols = model_info
-    return render(request, 'admin_model_list.html', {'data': model.objects.all(), 'model_name': model_name.capitalize(), 'columns': cols})
+    if model_name not in admin_lists.maps: return redirect('admin_panel')
+    return render(request, 'admin_model_list.html', {**admin_lists.page(model_name, request.GET), 'model_name': model_name.capitalize()})
 
 @login_required(login_url='login')
 @user_passes_test(is_admin)
 def delete_user(request, user_id):
-    User.objects.filter(id=user_id, is_superuser=False).delete()
+    stats.record_deleted(User.objects.filter(id=user_id, is_superuser=False).delete()[1])
     return redirect('admin_panel')
 
 class CustomObtainAuthToken(ObtainAuthToken):
     serializer_class = EmailAuthTokenSerializer
     parser_classes = [JSONParser]
+    throttle_classes = [AuthAttemptThrottle]
 
 @extend_schema_view(
     list=extend_schema(summary=_("Barcha hisoblarni olish"), tags=['Accounts']),
     create=extend_schema(summary=_("Yangi hisob yaratish"), tags=['Accounts']),
 )
-class AccountViewSet(viewsets.ModelViewSet):
+class AccountViewSet(ConditionalListMixin, FastListMixin, viewsets.ModelViewSet):
     serializer_class = AccountSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     def get_queryset(self):
         return Account.objects.filter(user=self.request.user)
+    def perform_destroy(self, instance):
+        stats.record_deleted(instance.delete()[1])
 
 @extend_schema_view(
     list=extend_schema(summary=_("Barcha tranzaksiyalarni olish"), tags=['Transactions']),
     create=extend_schema(summary=_("Yangi tranzaksiya yaratish"), tags=['Transactions']),
 )
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(ConditionalListMixin, FastListMixin, viewsets.ModelViewSet):
     serializer_class = TransactionSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TransactionCursorPagination
     def get_queryset(self):
         queryset = Transaction.objects.filter(account__user=self.request.user)
         transaction_type = self.request.query_params.get('type')
         if transaction_type: queryset = queryset.filter(type=transaction_type)
-        category = self.request.query_params.get('category')
-        if category: queryset = queryset.filter(category__icontains=category)
-        return queryset.order_by('-date')
+        query = self.request.query_params.get('search') or self.request.query_params.get('category')
+        if query: queryset = search_index.filter_transactions(queryset, self.request.user, query)
+        return queryset.order_by('-date', '-id')
+    def perform_create(self, serializer):
+        rollups.record([serializer.save()])
+    @transaction.atomic
+    def perform_update(self, serializer):
+        rollups.unrecord([Transaction.objects.select_related('account').get(pk=serializer.instance.pk)])
+        rollups.record([serializer.save()])
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            stats.record_deleted(instance.delete()[1])
+            rollups.unrecord([instance])
+        versions.touch_owner(Account, pk=instance.account_id)
+
+    @extend_schema(
+        summary=_("Tranzaksiyalarni moslik bo'yicha qidirish"),
+        tags=['Transactions'],
+        parameters=[
+            OpenApiParameter('q', OpenApiTypes.STR, description=_("Kategoriya yoki hisob nomi (so'z boshi ham mos keladi)")),
+            OpenApiParameter('limit', OpenApiTypes.INT),
+        ],
+    )
+    @action(detail=False, methods=['get'], url_path='search', pagination_class=None)
+    def search(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', search_index.RANKED_LIMIT)), 1), 100)
+        except ValueError:
+            limit = search_index.RANKED_LIMIT
+        results = search_index.ranked(request.user, request.query_params.get('q', ''), limit)
+        return Response(self.get_serializer(results, many=True).data)
+
+    @extend_schema(
+        summary=_("Tranzaksiyalarni fayldan import qilish (CSV, JSON yoki JSON Lines)"),
+        tags=['Transactions'],
+        request={'multipart/form-data': {'type': 'object', 'properties': {'file': {'type': 'string', 'format': 'binary'}}}},
+        responses={201: OpenApiTypes.OBJECT, 422: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'detail': _("Fayl yuborilmadi.")}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.data.get('format') or importers.guess_format(upload.name)
+        report = importers.import_transactions(request.user, upload.file, fmt)
+        # Birorta ham qator yozilmagan bo'lsa, so'rov muvaffaqiyatli hisoblanmaydi.
+        if not report['imported'] and report['failed']:
+            return Response(report, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        return Response(report, status=status.HTTP_201_CREATED)
 
 @extend_schema_view(
     list=extend_schema(summary=_("Barcha maqsadlarni olish"), tags=['Goals']),
     create=extend_schema(summary=_("Yangi maqsad yaratish"), tags=['Goals']),
 )
-class GoalViewSet(viewsets.ModelViewSet):
+class GoalViewSet(ConditionalListMixin, FastListMixin, viewsets.ModelViewSet):
     serializer_class = GoalSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     def get_queryset(self):
         return FinancialGoal.objects.filter(user=self.request.user)
\ No newline at end of file